@@ -0,0 +1,85 @@
+"""Compare layout time and object count for a form of label/control rows,
+with and without flattening the rows into a single flex grid sizer.
+
+Run from the root of the repository with:
+
+python -m benchmarks.layout"""
+
+from argparse import ArgumentParser, ArgumentDefaultsHelpFormatter
+from time import perf_counter
+import wx
+from xmlui.wx import WXXMLParser
+
+row_code = """
+        <sizer>
+            <label>Setting %d</label>
+            <text name="setting_%d" sizer_proportion="1">%d</text>
+        </sizer>
+"""
+
+parser = ArgumentParser(formatter_class=ArgumentDefaultsHelpFormatter)
+
+parser.add_argument(
+    '-r', '--rows', type=int, default=200, help='The number of rows to create'
+)
+parser.add_argument(
+    '-n', '--number', type=int, default=5,
+    help='The number of times to build each form'
+)
+
+
+class OptimizingXMLParser(WXXMLParser):
+    """Flatten rows into flex grid sizers."""
+
+    optimize_layout = True
+
+
+def count_sizers(sizer):
+    """Return the number of sizers in the tree starting at sizer."""
+    count = 1
+    for item in sizer.GetChildren():
+        if item.IsSizer():
+            count += count_sizers(item.GetSizer())
+    return count
+
+
+def build(xml, code):
+    """Populate a frame and lay it out. Returns a tuple containing the time
+    taken to populate, the time taken to lay out, and the number of sizers
+    created."""
+    f = wx.Frame(None)
+    started = perf_counter()
+    xml.populate_from_string(code, f, None)
+    populated = perf_counter()
+    f.Layout()
+    laid_out = perf_counter()
+    sizers = count_sizers(f.GetChildren()[0].GetSizer())
+    f.Destroy()
+    return (populated - started, laid_out - populated, sizers)
+
+
+def main(args):
+    a = wx.App()
+    code = '<frame><sizer orient="vertical">%s</sizer></frame>' % ''.join(
+        row_code % (x, x, x) for x in range(args.rows)
+    )
+    for name, xml in (
+        ('nested', WXXMLParser()), ('flattened', OptimizingXMLParser())
+    ):
+        populate = 0.0
+        layout = 0.0
+        for x in range(args.number):
+            p, l, sizers = build(xml, code)
+            populate += p
+            layout += l
+        print(
+            '%s: populate %.4f seconds, layout %.4f seconds, %d sizers.' % (
+                name, populate / args.number, layout / args.number, sizers
+            )
+        )
+    a.Destroy()
+
+
+if __name__ == '__main__':
+    args = parser.parse_args()
+    main(args)
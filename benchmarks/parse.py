@@ -0,0 +1,89 @@
+"""Measure parsing, dispatch and schema compilation using the headless
+backend, so no display is needed.
+
+Run from the root of the repository with:
+
+python -m benchmarks.parse"""
+
+from argparse import ArgumentParser, ArgumentDefaultsHelpFormatter
+from timeit import timeit
+from xml.etree.ElementTree import fromstring
+from xmlui.headless import HeadlessXMLParser, HeadlessFrame
+from xmlui.layout import flatten_rows
+
+repeat_code = """
+<frame>
+    <sizer orient="vertical">
+        <repeat over="settings">
+            <sizer>
+                <label>$item</label>
+                <integer name="setting" sizer_proportion="1"
+                    min="0">$index</integer>
+            </sizer>
+        </repeat>
+    </sizer>
+</frame>
+"""
+
+row_code = """
+            <sizer>
+                <label>%s</label>
+                <integer name="setting_%d" sizer_proportion="1"
+                    min="0">%d</integer>
+            </sizer>
+"""
+
+parser = ArgumentParser(formatter_class=ArgumentDefaultsHelpFormatter)
+
+parser.add_argument(
+    '-r', '--rows', type=int, default=1000, help='The number of rows to create'
+)
+parser.add_argument(
+    '-n', '--number', type=int, default=20,
+    help='The number of times to run each benchmark'
+)
+
+
+def main(args):
+    xml = HeadlessXMLParser()
+    data = dict(settings=['Setting %d' % x for x in range(args.rows)])
+    expanded_code = '<frame><sizer orient="vertical">%s</sizer></frame>' % (
+        ''.join(
+            row_code % (setting, x, x)
+            for x, setting in enumerate(data['settings'])
+        )
+    )
+    expanded_root = fromstring(expanded_code)
+    repeat_root = fromstring(repeat_code)
+    benchmarks = [
+        ('parse expanded XML', lambda: fromstring(expanded_code)),
+        (
+            'populate from expanded XML',
+            lambda: xml.populate_from_string(expanded_code, HeadlessFrame())
+        ),
+        (
+            'populate from parsed expanded XML',
+            lambda: xml.populate_from_root(expanded_root, HeadlessFrame())
+        ),
+        (
+            'populate from repeat',
+            lambda: xml.populate_from_root(
+                repeat_root, HeadlessFrame(), data=data
+            )
+        ),
+        ('flatten rows', lambda: flatten_rows(expanded_root)),
+        (
+            'compile schemas',
+            lambda: [
+                xml.compile_schema(schema) for schema in xml.schemas.values()
+            ]
+        )
+    ]
+    for name, func in benchmarks:
+        seconds = timeit(func, number=args.number)
+        print('%s: %.6f seconds.' % (name, seconds / args.number))
+
+
+if __name__ == '__main__':
+    args = parser.parse_args()
+    main(args)
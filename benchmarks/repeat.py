@@ -0,0 +1,83 @@
+"""Compare populating rows with the repeat tag to populating the equivalent
+expanded XML.
+
+Run from the root of the repository with:
+
+python -m benchmarks.repeat
+
+populate_from_string parses the XML every time, so the repeat template is
+compiled for every frame. The "repeat (parsed once)" benchmark keeps the
+parsed root, so the template is only compiled once."""
+
+from argparse import ArgumentParser, ArgumentDefaultsHelpFormatter
+from timeit import timeit
+from xml.etree.ElementTree import fromstring
+import wx
+from xmlui.wx import WXXMLParser
+
+repeat_code = """
+<frame>
+    <sizer orient="vertical">
+        <repeat over="settings">
+            <sizer>
+                <label>$item</label>
+                <text name="setting" sizer_proportion="1">$index</text>
+            </sizer>
+        </repeat>
+    </sizer>
+</frame>
+"""
+
+row_code = """
+            <sizer>
+                <label>%s</label>
+                <text name="setting_%d" sizer_proportion="1">%d</text>
+            </sizer>
+"""
+
+parser = ArgumentParser(formatter_class=ArgumentDefaultsHelpFormatter)
+
+parser.add_argument(
+    '-r', '--rows', type=int, default=1000, help='The number of rows to create'
+)
+parser.add_argument(
+    '-n', '--number', type=int, default=5,
+    help='The number of times to populate each frame'
+)
+
+
+def populate(xml, code, data):
+    """Populate and destroy a frame. If code is a string, it is parsed first,
+    otherwise it should be a parsed root."""
+    f = wx.Frame(None)
+    if isinstance(code, str):
+        xml.populate_from_string(code, f, None, data=data)
+    else:
+        xml.populate_from_root(code, f, None, data=data)
+    f.Destroy()
+
+
+def main(args):
+    a = wx.App()
+    xml = WXXMLParser()
+    data = dict(settings=['Setting %d' % x for x in range(args.rows)])
+    expanded_code = '<frame><sizer orient="vertical">%s</sizer></frame>' % (
+        ''.join(
+            row_code % (setting, x, x)
+            for x, setting in enumerate(data['settings'])
+        )
+    )
+    for name, code in (
+        ('expanded', expanded_code), ('repeat', repeat_code),
+        ('repeat (parsed once)', fromstring(repeat_code))
+    ):
+        seconds = timeit(
+            lambda: populate(xml, code, data), number=args.number
+        )
+        print('%s: %.4f seconds.' % (name, seconds / args.number))
+    a.Destroy()
+
+
+if __name__ == '__main__':
+    args = parser.parse_args()
+    main(args)
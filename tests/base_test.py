@@ -1,8 +1,11 @@
 """Test the base XMLParser class."""
 
 from pytest import raises
-from xmlui.base import XMLParser
-from xmlui.exc import NoParserError
+from xml.etree.ElementTree import Element
+from xmlui.base import XMLParser, Attribute
+from xmlui.exc import (
+    NoParserError, AttributeConversionError, MissingAttributeError
+)
 
 works_code = """
 <frame>
@@ -22,6 +25,28 @@ name_code = """
 </frame>
 """
 
+nested_code = """
+<frame>
+    <group>
+        <number value="five"></number>
+    </group>
+</frame>
+"""
+
+
+siblings_code = """
+<frame>
+    <group>
+        <number value="1"></number>
+    </group>
+    <group>
+        <label></label>
+        <number value="2"></number>
+        <number value="three"></number>
+    </group>
+</frame>
+"""
+
 
 class NodeWorks(Exception):
     pass
@@ -40,6 +65,31 @@ class DummyFrame:
 
 class MyXMLParser(XMLParser):
 
+    schemas = {
+        'number': (
+            Attribute('value', type=int, required=True),
+            Attribute('scale', type=float, default=1.0),
+            Attribute('values', type=int, list=True, key='numbers'),
+            Attribute('title', type='upper')
+        )
+    }
+
+    def upper(self, text):
+        """Used to test method names as types."""
+        return text.upper()
+
+    def parse_group(self, node, frame):
+        """Parse all children."""
+        for child in node:
+            self.parse_node(child, frame)
+
+    def parse_number(self, node, frame):
+        """Return converted attributes."""
+        return self.get_attributes(node)
+
+    def parse_label(self, node, frame):
+        """Do nothing."""
+
     def parse_works(self, node, frame):
         raise NodeWorks()
 
@@ -78,3 +128,64 @@ def test_get_list_with_start():
 
 def test_get_list_with_func():
     assert xml.get_list('1,2,3,4', function=float) == [1.0, 2.0, 3.0, 4.0]
+
+
+def test_attributes_defaults():
+    root = Element('number', value='5')
+    assert xml.parse_number(root, None) == dict(
+        value=5, scale=1.0, numbers=None, title=None
+    )
+
+
+def test_attributes_converted():
+    root = Element(
+        'number', value='5', scale='0.5', values='1, 2', title='test'
+    )
+    assert xml.parse_number(root, None) == dict(
+        value=5, scale=0.5, numbers=[1, 2], title='TEST'
+    )
+
+
+def test_attributes_no_schema():
+    assert xml.get_attributes(Element('tag', value='5')) == {}
+
+
+def test_converter_cached():
+    assert xml.get_converter('number') is xml.get_converter('number')
+
+
+def test_no_super_init():
+    class InitXMLParser(MyXMLParser):
+        def __init__(self):
+            self.initialised = True
+
+    parser = InitXMLParser()
+    assert parser.get_converter('number') is parser.get_converter('number')
+    assert parser.converters is not xml.converters
+
+
+def test_attributes_missing():
+    with raises(MissingAttributeError) as exc:
+        xml.parse_number(Element('number'), None)
+    assert exc.value.name == 'value'
+    assert exc.value.path == ['number']
+
+
+def test_attributes_invalid():
+    with raises(AttributeConversionError) as exc:
+        xml.populate_from_string(nested_code, None)
+    e = exc.value
+    assert e.name == 'value'
+    assert e.value == 'five'
+    assert e.path == ['group', 'number']
+    assert str(e) == "group/number@value: Could not convert 'five'."
+
+
+def test_attributes_invalid_position():
+    with raises(AttributeConversionError) as exc:
+        xml.populate_from_string(siblings_code, None)
+    e = exc.value
+    assert e.path == ['group[2]', 'number[2]']
+    assert [node.tag for node in e.nodes] == ['group', 'number']
+    assert e.nodes[-1] is e.node
+    assert str(e) == "group[2]/number[2]@value: Could not convert 'three'."
@@ -0,0 +1,27 @@
+"""Test the parts shared between backends."""
+
+from xmlui.base import XMLParser
+from xmlui.controls import get_schemas
+from xmlui.headless import HeadlessXMLParser
+
+
+def test_flags():
+    schemas = get_schemas(str.lower)
+    defaults = {
+        (tag, attribute.name): attribute.default
+        for tag, attributes in schemas.items() for attribute in attributes
+        if attribute.type == 'get_flags'
+    }
+    assert defaults == {
+        ('*', 'style'): None,
+        ('*', 'sizer_flag'): 'grow',
+        ('sizer', 'orient'): 'horizontal',
+        ('table', 'style'): 'lc_icon',
+        ('column', 'format'): 'list_format_left'
+    }
+
+
+def test_headless_schemas():
+    assert set(HeadlessXMLParser.schemas) == set(get_schemas(str)) | set(
+        XMLParser.schemas
+    )
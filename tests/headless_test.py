@@ -0,0 +1,189 @@
+"""Test the headless backend."""
+
+import os
+from xml.etree.ElementTree import Element
+from pytest import raises
+from xmlui.exc import (
+    DuplicateSizerError, InvalidTagError, NoValueError,
+    AttributeConversionError
+)
+from xmlui.headless import HeadlessXMLParser, HeadlessFrame, Control
+
+frame_xml = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), 'frame.xml'
+)
+
+duplicate_sizers_code = """
+<frame>
+    <sizer></sizer>
+    <sizer></sizer>
+</frame>
+"""
+
+
+class MyXMLParser(HeadlessXMLParser):
+    """Add event handlers."""
+
+    settings = ['First', 'Second']
+
+    def on_paste(self, event):
+        pass
+
+    def on_copy(self, event):
+        pass
+
+    def on_login(self, event):
+        pass
+
+    def close(self, event):
+        pass
+
+
+xml = MyXMLParser()
+
+
+def test_control_slots():
+    c = Control('label')
+    with raises(AttributeError):
+        c.anything = True
+    assert c.children is None
+    assert Control('sizer').children == []
+
+
+def test_frame_xml():
+    f = HeadlessFrame()
+    xml.populate_from_file(frame_xml, f)
+    assert f.title == 'Pretend Login'
+    assert f.sizer is f.main_sizer
+    assert f.sizer.options == dict(orient=('VERTICAL',))
+    assert len(f.sizer.children) == 8
+    assert f.username.value == 'test'
+    assert f.username.style == ('TE_RICH2',)
+    assert f.username.proportion == 1
+    assert f.username.flag == ('GROW',)
+    assert f.password.binders == [
+        ('TEXT_PASTE', xml.on_paste), ('TEXT_COPY', xml.on_copy)
+    ]
+    assert f.age.value == 18
+    assert f.age.options['min'] == 10
+    assert f.height.value == 1.5
+    assert f.height.options['increment'] == 0.1
+    assert f.rating.value == 3
+    assert f.agree.value is False
+    assert f.agree.label == 'I &Agree'
+    assert f.login.options == dict(default=1)
+    table = f.sizer.children[0].children[1]
+    assert table.tag == 'table'
+    assert table.value == 2
+    assert table.style is None
+    assert table.options['style'] == ('LC_REPORT',)
+    assert [c[0] for c in table.options['columns']] == [
+        'Name', 'Hostname', 'Port'
+    ]
+    assert table.options['items'][1] == ['BBC', 'bbc.co.uk', '80']
+    assert len(f.controls) == 25
+
+
+def test_no_super_init():
+    class InitXMLParser(MyXMLParser):
+        def __init__(self):
+            self.initialised = True
+
+    f = HeadlessFrame()
+    InitXMLParser().populate_from_file(frame_xml, f)
+    assert f.title == 'Pretend Login'
+
+
+def test_invalid_attribute():
+    with open(frame_xml) as f:
+        code = f.read().replace('min="0"', 'min="low"')
+    with raises(AttributeConversionError) as exc:
+        xml.populate_from_string(code, HeadlessFrame())
+    assert exc.value.path == ['sizer', 'sizer[6]', 'slider']
+
+
+def test_panel():
+    f = HeadlessFrame()
+    xml.populate_from_string('<frame></frame>', f, None)
+    assert len(f.controls) == 1
+    assert f.controls[0].tag == 'panel'
+
+
+def test_duplicate_sizers():
+    with raises(DuplicateSizerError):
+        xml.populate_from_string(duplicate_sizers_code, HeadlessFrame())
+
+
+def test_grids():
+    root = Element('flexgrid', cols='3', growable_cols='1, 2')
+    root.append(Element('label'))
+    f = HeadlessFrame()
+    s = xml.parse_node(root, f, f, None)
+    assert s.tag == 'flexgrid'
+    assert s.options['cols'] == 3
+    assert s.options['growable_cols'] == [1, 2]
+    assert [c.tag for c in s.children] == ['label']
+    s = xml.parse_node(Element('grid', rows='4'), f, f, None)
+    assert s.tag == 'grid'
+    assert s.options['rows'] == 4
+
+
+def test_choices():
+    root = Element('choice', choices='First, Second')
+    root.text = '1'
+    c = xml.parse_node(root, HeadlessFrame(), None, None)
+    assert c.options == dict(choices=['First', 'Second'])
+    assert c.value == 1
+    c = xml.parse_node(Element('list'), HeadlessFrame(), None, None)
+    assert c.tag == 'list'
+    assert c.value is None
+    assert c.options == dict(choices=None, virtual=0)
+
+
+def test_virtual_list():
+    root = Element('list', virtual='1', choices='First, Second')
+    c = xml.parse_node(root, HeadlessFrame(), None, None)
+    assert c.options == dict(choices=['First', 'Second'], virtual=1)
+
+
+def test_set_items():
+    root = Element('choice', choices='First')
+    c = xml.parse_node(root, HeadlessFrame(), None, None)
+    options = c.options
+    xml.set_items(c, (str(x) for x in range(3)))
+    assert c.options['choices'] == ['0', '1', '2']
+    assert options['choices'] == ['First']
+    xml.append_items(c, ['3'])
+    assert c.options['choices'] == ['0', '1', '2', '3']
+    c = xml.parse_node(Element('list'), HeadlessFrame(), None, None)
+    xml.append_items(c, ['First'])
+    assert c.options['choices'] == ['First']
+
+
+def test_repeat():
+    code = """
+    <frame>
+        <sizer orient="vertical">
+            <repeat over="settings" name="rows">
+                <sizer>
+                    <label>$item</label>
+                    <text name="setting">$index</text>
+                </sizer>
+            </repeat>
+        </sizer>
+    </frame>
+    """
+    f = HeadlessFrame()
+    xml.populate_from_string(code, f)
+    assert f.sizer.children == f.rows
+    assert f.setting_1.value == '1'
+    assert f.rows[0].children[0].value == 'First'
+
+
+def test_table_errors():
+    root = Element('table')
+    root.append(Element('fails'))
+    with raises(InvalidTagError):
+        xml.parse_node(root, HeadlessFrame(), None, None)
+    with raises(NoValueError):
+        xml.parse_column(Element('column'), None, None, None)
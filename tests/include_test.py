@@ -0,0 +1,251 @@
+"""Test the include tag and FragmentCache class."""
+
+import os
+from xml.etree.ElementTree import Element, fromstring
+from pytest import raises
+from xmlui.base import XMLParser
+from xmlui.exc import IncludeCycleError, MissingAttributeError
+from xmlui.include import FragmentCache, substitute
+
+bar_code = """
+<fragment>
+    <label>$title</label>
+    <button>Play</button>
+</fragment>
+"""
+
+window_code = """
+<frame>
+    <title>Window</title>
+    <include src="bar.xml" title="Playback"/>
+</frame>
+"""
+
+other_code = """
+<frame>
+    <include src="other_bar.xml"/>
+</frame>
+"""
+
+other_bar_code = """
+<fragment>
+    <label>Other</label>
+    <button>Other</button>
+</fragment>
+"""
+
+
+tail_code = """<frame><title>Window</title>
+<include src="bar.xml" title="Playback"/>after<include src="empty.xml"/>end
+</frame>"""
+
+
+class DummyFrame:
+    """A pretend frame class."""
+
+
+class MyXMLParser(XMLParser):
+
+    def parse_title(self, node, frame):
+        frame.title = node.text
+
+    def parse_label(self, node, frame):
+        frame.labels.append(node.text)
+
+    def parse_button(self, node, frame):
+        frame.buttons.append(node.text)
+
+
+def write(path, code):
+    """Write code to path, making sure the mtime changes."""
+    exists = path.exists()
+    if exists:
+        mtime = path.stat().st_mtime_ns
+    path.write_text(code)
+    if exists:
+        os.utime(path, ns=(mtime + 1000000000, mtime + 1000000000))
+
+
+def make_files(tmp_path):
+    write(tmp_path / 'bar.xml', bar_code)
+    write(tmp_path / 'window.xml', window_code)
+    write(tmp_path / 'other.xml', other_code)
+    write(tmp_path / 'other_bar.xml', other_bar_code)
+
+
+def tags(root):
+    return [node.tag for node in root]
+
+
+def test_substitute():
+    node = Element('label', colour='$colour')
+    node.text = '$title ($missing)'
+    child = Element('button')
+    child.text = '$title'
+    node.append(child)
+    copy = substitute(node, dict(title='Test', colour='red'))
+    assert copy is not node
+    assert copy.attrib == dict(colour='red')
+    assert copy.text == 'Test ($missing)'
+    assert copy[0].text == 'Test'
+    assert node.text == '$title ($missing)'
+
+
+def test_include(tmp_path):
+    make_files(tmp_path)
+    cache = FragmentCache()
+    root = cache.get(str(tmp_path / 'window.xml'))
+    assert tags(root) == ['title', 'label', 'button']
+    assert root[1].text == 'Playback'
+    assert cache.get(str(tmp_path / 'window.xml')) is root
+
+
+def test_fragment_shared(tmp_path):
+    make_files(tmp_path)
+    cache = FragmentCache()
+    cache.get(str(tmp_path / 'other.xml'))
+    bar = cache.fragments[str(tmp_path / 'other_bar.xml')]
+    root = cache.get(str(tmp_path / 'other.xml'))
+    assert root[0] is bar.root[0]
+    # The last node is copied to hold the tail of the include tag.
+    assert root[1] is not bar.root[1]
+    assert root[1].text == bar.root[1].text
+
+
+def test_no_includes(tmp_path):
+    make_files(tmp_path)
+    cache = FragmentCache()
+    filename = str(tmp_path / 'bar.xml')
+    assert cache.get(filename) is cache.fragments[filename].root
+
+
+def test_tail(tmp_path):
+    make_files(tmp_path)
+    write(tmp_path / 'empty.xml', '<fragment/>')
+    write(tmp_path / 'tail.xml', tail_code)
+    write(
+        tmp_path / 'empty_tail.xml',
+        '<frame>a<include src="empty.xml"/>b</frame>'
+    )
+    cache = FragmentCache()
+    bar = cache.get(str(tmp_path / 'bar.xml'))
+    root = cache.get(str(tmp_path / 'tail.xml'))
+    assert tags(root) == ['title', 'label', 'button']
+    assert root[2].tail == '\nafterend\n'
+    assert root[2] is not bar[1]
+    assert bar[1].tail == '\n'
+    assert cache.get(str(tmp_path / 'empty_tail.xml')).text == 'ab'
+
+
+def test_invalidation(tmp_path):
+    make_files(tmp_path)
+    cache = FragmentCache()
+    window = cache.get(str(tmp_path / 'window.xml'))
+    other = cache.get(str(tmp_path / 'other.xml'))
+    write(tmp_path / 'bar.xml', bar_code.replace('Play', 'Pause'))
+    new_window = cache.get(str(tmp_path / 'window.xml'))
+    assert new_window is not window
+    assert new_window[2].text == 'Pause'
+    assert cache.get(str(tmp_path / 'other.xml')) is other
+
+
+def test_same_contents(tmp_path):
+    make_files(tmp_path)
+    cache = FragmentCache()
+    window = cache.get(str(tmp_path / 'window.xml'))
+    write(tmp_path / 'bar.xml', bar_code)
+    assert cache.get(str(tmp_path / 'window.xml')) is window
+
+
+def test_cycle(tmp_path):
+    write(tmp_path / 'first.xml', '<frame><include src="second.xml"/></frame>')
+    write(tmp_path / 'second.xml', '<frame><include src="first.xml"/></frame>')
+    cache = FragmentCache()
+    with raises(IncludeCycleError) as exc:
+        cache.get(str(tmp_path / 'first.xml'))
+    first = str(tmp_path / 'first.xml')
+    second = str(tmp_path / 'second.xml')
+    assert exc.value.args == (first, second, first)
+
+
+def test_no_src(tmp_path):
+    write(tmp_path / 'window.xml', '<frame><include/></frame>')
+    cache = FragmentCache()
+    with raises(MissingAttributeError):
+        cache.get(str(tmp_path / 'window.xml'))
+
+
+def test_graph(tmp_path):
+    make_files(tmp_path)
+    cache = FragmentCache()
+    cache.get(str(tmp_path / 'window.xml'))
+    cache.get(str(tmp_path / 'other.xml'))
+    window = str(tmp_path / 'window.xml')
+    bar = str(tmp_path / 'bar.xml')
+    assert cache.graph() == {
+        window: {bar},
+        bar: set(),
+        str(tmp_path / 'other.xml'): {str(tmp_path / 'other_bar.xml')},
+        str(tmp_path / 'other_bar.xml'): set()
+    }
+    assert cache.dependents(bar) == {window}
+
+
+def test_nested_dependents(tmp_path):
+    make_files(tmp_path)
+    write(tmp_path / 'outer.xml', '<frame><include src="window.xml"/></frame>')
+    cache = FragmentCache()
+    root = cache.get(str(tmp_path / 'outer.xml'))
+    assert tags(root) == ['title', 'label', 'button']
+    assert cache.dependents(str(tmp_path / 'bar.xml')) == {
+        str(tmp_path / 'window.xml'), str(tmp_path / 'outer.xml')
+    }
+
+
+def test_populate_from_file(tmp_path):
+    make_files(tmp_path)
+    xml = MyXMLParser()
+    xml.fragments = FragmentCache()
+    frame = DummyFrame()
+    frame.labels = []
+    frame.buttons = []
+    xml.populate_from_file(str(tmp_path / 'window.xml'), frame)
+    assert frame.title == 'Window'
+    assert frame.labels == ['Playback']
+    assert frame.buttons == ['Play']
+    with open(tmp_path / 'window.xml') as f:
+        xml.populate_from_file(f, frame)
+    assert frame.labels == ['Playback', 'Playback']
+
+
+def test_populate_from_string(tmp_path):
+    make_files(tmp_path)
+    xml = MyXMLParser()
+    xml.fragments = FragmentCache()
+    frame = DummyFrame()
+    frame.labels = []
+    frame.buttons = []
+    cwd = os.getcwd()
+    os.chdir(tmp_path)
+    try:
+        xml.populate_from_string(other_code, frame)
+    finally:
+        os.chdir(cwd)
+    assert frame.labels == ['Other']
+
+
+def test_populate_from_root(tmp_path):
+    make_files(tmp_path)
+    xml = MyXMLParser()
+    xml.fragments = FragmentCache()
+    frame = DummyFrame()
+    frame.labels = []
+    frame.buttons = []
+    cwd = os.getcwd()
+    os.chdir(tmp_path)
+    try:
+        xml.populate_from_root(fromstring(window_code), frame)
+    finally:
+        os.chdir(cwd)
+    assert frame.labels == ['Playback']
+    assert frame.buttons == ['Play']
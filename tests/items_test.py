@@ -0,0 +1,44 @@
+"""Test the CompactStrings class."""
+
+from pytest import raises
+from xmlui.items import CompactStrings
+
+hosts = ['mindspace.site', 'bbc.co.uk', 'Google.com', '', 'bbc.com']
+
+
+def test_empty():
+    s = CompactStrings()
+    assert len(s) == 0
+    assert list(s) == []
+    assert s.find('a') == -1
+
+
+def test_items():
+    s = CompactStrings(hosts)
+    assert len(s) == len(hosts)
+    assert list(s) == hosts
+    for x, host in enumerate(hosts):
+        assert s[x] == host
+    assert s[-1] == hosts[-1]
+    with raises(IndexError):
+        s[len(hosts)]
+    with raises(IndexError):
+        s[-len(hosts) - 1]
+
+
+def test_extend():
+    s = CompactStrings(hosts[:2])
+    assert s.find('goo') == -1
+    s.extend(hosts[2:])
+    assert list(s) == hosts
+    assert s.find('goo') == 2
+
+
+def test_find():
+    s = CompactStrings(hosts)
+    assert s.find('m') == 0
+    assert s.find('BBC') == 1
+    assert s.find('bbc.com') == 4
+    assert s.find('google') == 2
+    assert s.find('z') == -1
+    assert s.find('') == 3
@@ -0,0 +1,166 @@
+"""Test layout optimisations."""
+
+from xml.etree.ElementTree import fromstring, tostring
+from xmlui.headless import HeadlessXMLParser, HeadlessFrame
+from xmlui.layout import flatten_rows
+
+rows_code = """
+<frame>
+    <sizer orient="vertical">
+        <sizer>
+            <label>Username</label>
+            <text name="username" sizer_proportion="1"></text>
+        </sizer>
+        <sizer orient="horizontal">
+            <label>Password</label>
+            <text name="password" sizer_proportion="1"></text>
+        </sizer>
+        <sizer>
+            <label>Age</label>
+            <integer name="age"></integer>
+        </sizer>
+        <sizer name="buttons">
+            <button name="ok"></button>
+            <button name="cancel"></button>
+        </sizer>
+        <sizer>
+            <label>Agree</label>
+            <checkbox name="agree"></checkbox>
+        </sizer>
+    </sizer>
+</frame>
+"""
+
+unchanged_code = """
+<frame>
+    <sizer>
+        <sizer>
+            <label>Username</label>
+            <text name="username"></text>
+        </sizer>
+        <sizer>
+            <label>Password</label>
+            <text name="password"></text>
+        </sizer>
+    </sizer>
+    <sizer orient="vertical">
+        <sizer sizer_proportion="1">
+            <label>Username</label>
+            <text name="username"></text>
+        </sizer>
+        <sizer>
+            <label>Password</label>
+            <text name="password"></text>
+            <button>Show</button>
+        </sizer>
+    </sizer>
+</frame>
+"""
+
+irregular_code = """
+<frame>
+    <sizer orient="vertical">
+        <sizer>
+            <label>Username</label>
+            <text name="username"></text>
+        </sizer>
+        <sizer>
+            <label>Tags</label>
+            <repeat over="tags">
+                <checkbox></checkbox>
+            </repeat>
+        </sizer>
+        <sizer>
+            <label>Title</label>
+            <title>Title</title>
+        </sizer>
+        <sizer>
+            <label sizer_proportion="1">Password</label>
+            <text name="password"></text>
+        </sizer>
+        <sizer>
+            <label sizer_flag="all">Age</label>
+            <integer name="age"></integer>
+        </sizer>
+        <sizer>
+            <label>Height</label>
+            <float name="height"></float>
+        </sizer>
+    </sizer>
+</frame>
+"""
+
+repeat_code = """
+<frame>
+    <sizer orient="vertical">
+        <repeat over="settings">
+            <sizer>
+                <label>$item</label>
+                <text name="setting"></text>
+            </sizer>
+        </repeat>
+    </sizer>
+</frame>
+"""
+
+
+def tags(node):
+    return [child.tag for child in node]
+
+
+def test_flatten():
+    root = fromstring(rows_code)
+    before = tostring(root)
+    new = flatten_rows(root)
+    assert tostring(root) == before
+    sizer, = new
+    assert tags(sizer) == ['flexgrid', 'sizer', 'sizer']
+    grid = sizer[0]
+    assert grid.attrib == dict(cols='2', growable_cols='1')
+    assert tags(grid) == ['label', 'text', 'label', 'text', 'label', 'integer']
+    assert grid[1] is root[0][0][1]
+    assert sizer[1] is root[0][3]
+    assert sizer[2] is root[0][4]
+
+
+def test_min_rows():
+    root = fromstring(rows_code)
+    sizer, = flatten_rows(root, min_rows=1)
+    assert tags(sizer) == ['flexgrid', 'sizer', 'flexgrid']
+    assert sizer[2].attrib == dict(cols='2')
+
+
+def test_unchanged():
+    root = fromstring(unchanged_code)
+    assert flatten_rows(root) is root
+
+
+def test_irregular():
+    root = fromstring(irregular_code)
+    assert flatten_rows(root) is root
+    root = fromstring(irregular_code)
+    sizer, = flatten_rows(root, min_rows=1)
+    assert tags(sizer) == ['flexgrid'] + ['sizer'] * 4 + ['flexgrid']
+
+
+def test_irregular_headless():
+    class MyXMLParser(HeadlessXMLParser):
+        tags = ['First', 'Second', 'Third']
+
+    root = fromstring(irregular_code)
+    f = HeadlessFrame()
+    MyXMLParser().populate_from_root(flatten_rows(root, min_rows=1), f)
+    grid = f.sizer.children[0]
+    assert [c.tag for c in grid.children] == ['label', 'text']
+    row = f.sizer.children[1]
+    assert [c.tag for c in row.children] == ['label'] + ['checkbox'] * 3
+
+
+def test_repeat():
+    root = fromstring(repeat_code)
+    sizer, = flatten_rows(root)
+    grid, = sizer
+    assert grid.tag == 'flexgrid'
+    repeat, = grid
+    assert repeat.attrib == dict(over='settings')
+    assert tags(repeat) == ['label', 'text']
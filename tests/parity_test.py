@@ -0,0 +1,164 @@
+"""Make sure the headless backend produces the same structure as the wx
+backend."""
+
+import os
+from pytest import importorskip
+from xmlui.headless import HeadlessXMLParser, HeadlessFrame
+
+wx = importorskip('wx')
+from wx.lib.agw.floatspin import FloatSpin  # noqa: E402
+from wx.lib.intctrl import IntCtrl  # noqa: E402
+from xmlui.wx import WXXMLParser, VirtualListBox  # noqa: E402
+
+app = wx.App()  # Keep wx happy.
+
+frame_xml = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), 'frame.xml'
+)
+
+repeat_code = """
+<frame>
+    <title>Settings</title>
+    <sizer orient="vertical">
+        <repeat over="settings" name="rows">
+            <sizer>
+                <label>$item</label>
+                <text name="setting" sizer_proportion="1">$index</text>
+            </sizer>
+        </repeat>
+        <flexgrid cols="2" growable_cols="1">
+            <label>Choice</label>
+            <choice name="choice" choices="First, Second">1</choice>
+            <label>List</label>
+            <list name="list" choices="First, Second">0</list>
+            <label>Virtual</label>
+            <list name="virtual" virtual="1" choices="First, Second">1</list>
+        </flexgrid>
+        <grid cols="2">
+            <button name="ok" default="1">OK</button>
+            <button name="cancel">Cancel</button>
+        </grid>
+    </sizer>
+</frame>
+"""
+
+# Classes to tag names. Subclasses must come before their bases.
+wx_tags = [
+    (IntCtrl, 'integer'),
+    (FloatSpin, 'float'),
+    (wx.TextCtrl, 'text'),
+    (wx.StaticText, 'label'),
+    (wx.Slider, 'slider'),
+    (wx.CheckBox, 'checkbox'),
+    (wx.Button, 'button'),
+    (wx.Choice, 'choice'),
+    (wx.ListBox, 'list'),
+    (VirtualListBox, 'list'),
+    (wx.ListCtrl, 'table'),
+    (wx.FlexGridSizer, 'flexgrid'),
+    (wx.GridSizer, 'grid'),
+    (wx.BoxSizer, 'sizer')
+]
+
+
+class WXParser(WXXMLParser):
+    settings = ['First', 'Second', 'Third']
+
+    def on_paste(self, event):
+        pass
+
+    on_copy = on_login = close = on_paste
+
+
+class HeadlessParser(HeadlessXMLParser):
+    settings = WXParser.settings
+
+    def on_paste(self, event):
+        pass
+
+    on_copy = on_login = close = on_paste
+
+
+def get_tag(obj):
+    for cls, tag in wx_tags:
+        if isinstance(obj, cls):
+            return tag
+    raise TypeError(obj)
+
+
+def describe_wx(sizer):
+    """Return a nested list of (tag, children) tuples."""
+    res = []
+    for item in sizer.GetChildren():
+        if item.IsSizer():
+            s = item.GetSizer()
+            res.append((get_tag(s), describe_wx(s)))
+        else:
+            res.append((get_tag(item.GetWindow()), None))
+    return res
+
+
+def describe_headless(sizer):
+    """Return a nested list of (tag, children) tuples."""
+    res = []
+    for control in sizer.children:
+        if control.children is None:
+            res.append((control.tag, None))
+        else:
+            res.append((control.tag, describe_headless(control)))
+    return res
+
+
+def names(frame, cls):
+    """Return the names of all attributes of frame which are instances of
+    cls."""
+    return {
+        name for name, value in vars(frame).items() if isinstance(value, cls)
+    }
+
+
+def populate(code=None, filename=None):
+    """Populate a wx frame and a headless frame, and return them both."""
+    wx_frame = wx.Frame(None)
+    headless_frame = HeadlessFrame()
+    for xml, frame in (
+        (WXParser(), wx_frame), (HeadlessParser(), headless_frame)
+    ):
+        if code is None:
+            xml.populate_from_file(filename, frame)
+        else:
+            xml.populate_from_string(code, frame)
+    return (wx_frame, headless_frame)
+
+
+def check(wx_frame, headless_frame):
+    assert describe_wx(wx_frame.GetSizer()) == describe_headless(
+        headless_frame.sizer
+    )
+    assert wx_frame.GetTitle() == headless_frame.title
+    wx_names = names(wx_frame, (wx.Window, wx.Sizer))
+    assert wx_names
+    assert wx_names == names(headless_frame, object) - {
+        'title', 'sizer', 'controls', 'rows'
+    }
+
+
+def test_frame_xml():
+    wx_frame, headless_frame = populate(filename=frame_xml)
+    check(wx_frame, headless_frame)
+    for name in ('username', 'age', 'height', 'rating', 'agree'):
+        assert getattr(wx_frame, name).GetValue() == getattr(
+            headless_frame, name
+        ).value
+    wx_frame.Destroy()
+
+
+def test_repeat_and_grids():
+    wx_frame, headless_frame = populate(code=repeat_code)
+    check(wx_frame, headless_frame)
+    assert len(wx_frame.rows) == len(headless_frame.rows)
+    for name in ('choice', 'list', 'virtual'):
+        assert getattr(wx_frame, name).GetSelection() == getattr(
+            headless_frame, name
+        ).value
+    wx_frame.Destroy()
@@ -0,0 +1,187 @@
+"""Test the FramePool class."""
+
+from xml.etree.ElementTree import fromstring
+import wx
+from xmlui.pool import FramePool
+from xmlui.wx import WXXMLParser
+
+app = wx.App()  # Keep wx happy.
+
+xml = WXXMLParser()
+
+code = """
+<frame>
+    <sizer orient="vertical">
+        <text name="text">Testing</text>
+        <integer name="integer">5</integer>
+        <float name="float">1.5</float>
+        <slider name="slider">50</slider>
+        <checkbox name="checkbox">1</checkbox>
+        <choice name="choice" choices="First, Second">1</choice>
+        <list name="list" choices="First, Second">0</list>
+        <list name="virtual" virtual="1" choices="First, Second">1</list>
+        <table name="table" style="lc_report">
+            <column>Name</column>
+            <item>First</item>
+            <item>Second</item>
+            <item>Third</item>
+            <value>1</value>
+        </table>
+    </sizer>
+</frame>
+"""
+
+
+repeat_code = """
+<frame>
+    <sizer orient="vertical">
+        <repeat over="settings" name="rows">
+            <text name="setting">$item</text>
+        </repeat>
+    </sizer>
+</frame>
+"""
+
+
+def test_reuse():
+    pool = FramePool(xml)
+    root = fromstring(code)
+    f = pool.acquire(root)
+    assert isinstance(f, wx.Frame)
+    pool.release(f)
+    assert not f.IsShown()
+    assert pool.acquire(root) is f
+    g = pool.acquire(root)
+    assert g is not f
+    pool.clear()
+    f.Destroy()
+    g.Destroy()
+
+
+def test_different_layouts():
+    pool = FramePool(xml)
+    first = fromstring(code)
+    second = fromstring(code)
+    f = pool.acquire(first)
+    pool.release(f)
+    g = pool.acquire(second)
+    assert g is not f
+    assert pool.acquire(first) is f
+    f.Destroy()
+    g.Destroy()
+
+
+def test_reset():
+    pool = FramePool(xml)
+    root = fromstring(code)
+    f = pool.acquire(root)
+    f.text.SetValue('Changed')
+    f.integer.SetValue(10)
+    f.float.SetValue(2.5)
+    f.slider.SetValue(25)
+    f.checkbox.SetValue(False)
+    f.choice.SetSelection(0)
+    f.list.SetSelection(1)
+    f.virtual.SetSelection(0)
+    f.table.Select(1, on=0)
+    f.table.Select(0)
+    f.table.Select(2)
+    pool.release(f)
+    assert f.text.GetValue() == 'Testing'
+    assert f.integer.GetValue() == 5
+    assert f.float.GetValue() == 1.5
+    assert f.slider.GetValue() == 50
+    assert f.checkbox.GetValue()
+    assert f.choice.GetSelection() == 1
+    assert f.list.GetSelection() == 0
+    assert f.virtual.GetSelection() == 1
+    assert f.table.GetFirstSelected() == 1
+    assert f.table.GetNextSelected(1) == wx.NOT_FOUND
+    assert f.table.GetFocusedItem() == 1
+    pool.clear()
+
+
+def test_eviction():
+    pool = FramePool(xml, max_size=1)
+    first = fromstring(code)
+    second = fromstring(code)
+    f = pool.acquire(first)
+    g = pool.acquire(second)
+    pool.release(f)
+    pool.release(g)
+    assert list(pool.idle) == [g]
+    assert f not in pool.keys
+    h = pool.acquire(first)
+    assert h is not f
+    pool.clear()
+    h.Destroy()
+
+
+def test_close():
+    other = wx.Frame(None)
+    other.Show()
+    pool = FramePool(xml)
+    root = fromstring(code)
+    f = pool.acquire(root)
+    f.Show()
+    f.Close()
+    assert not f.IsShown()
+    assert f in pool.idle
+    pool.clear()
+    assert not pool.idle
+    other.Destroy()
+
+
+def test_close_last():
+    pool = FramePool(xml)
+    root = fromstring(code)
+    f = pool.acquire(root)
+    g = pool.acquire(root)
+    pool.release(g)
+    f.Show()
+    f.Close()
+    assert f not in pool.keys
+    assert not pool.idle
+
+
+def test_factory():
+    frame = wx.Frame(None)
+    pool = FramePool(xml, factory=lambda: wx.Panel(frame))
+    p = pool.acquire(fromstring(code))
+    assert isinstance(p, wx.Panel)
+    assert p.GetParent() is frame
+    frame.Destroy()
+
+
+def test_destroy():
+    frame = wx.Frame(None)
+    pool = FramePool(xml, factory=lambda: wx.Panel(frame))
+    root = fromstring(code)
+    p = pool.acquire(root)
+    q = pool.acquire(root)
+    pool.release(q)
+    p.Destroy()
+    assert p not in pool.keys
+    assert p not in pool.snapshots
+    q.Destroy()
+    assert not pool.keys
+    assert not pool.idle
+    assert not pool.snapshots
+    frame.Destroy()
+
+
+def test_data():
+    pool = FramePool(xml)
+    root = fromstring(repeat_code)
+    settings = ['First', 'Second']
+    f = pool.acquire(root, data=dict(settings=settings))
+    assert f.setting_1.GetValue() == 'Second'
+    pool.release(f)
+    assert pool.acquire(root, data=dict(settings=iter(settings))) is f
+    pool.release(f)
+    settings.append('Third')
+    g = pool.acquire(root, data=dict(settings=settings))
+    assert g is not f
+    assert len(g.rows) == 3
+    pool.release(g)
+    pool.clear()
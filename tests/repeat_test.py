@@ -0,0 +1,210 @@
+"""Test the repeat tag and RepeatTemplate class."""
+
+from xml.etree.ElementTree import Element, fromstring
+from pytest import raises
+from xmlui.base import XMLParser, Attribute
+from xmlui.exc import MissingAttributeError
+from xmlui.repeat import RepeatTemplate, StampedElement
+
+rows_code = """
+<frame>
+    <repeat over="settings" as="setting" name="rows">
+        <row name="row">
+            <label>$setting</label>
+            <text name="value_$setting">$index</text>
+        </row>
+    </repeat>
+</frame>
+"""
+
+mapping_code = """
+<frame>
+    <repeat over="get_servers">
+        <label name="server">$name ($port)</label>
+    </repeat>
+</frame>
+"""
+
+
+nested_code = """
+<frame>
+    <repeat over="outer" name="groups">
+        <row>
+            <label>$item</label>
+            <repeat over="inner" name="cells">
+                <text name="cell">$item/$index ($$5)</text>
+            </repeat>
+        </row>
+    </repeat>
+</frame>
+"""
+
+nested_as_code = """
+<frame>
+    <repeat over="outer" as="group">
+        <repeat over="inner" as="cell">
+            <label name="label">$group/$cell/$index</label>
+        </repeat>
+    </repeat>
+</frame>
+"""
+
+
+class DummyFrame:
+    """A pretend frame class."""
+
+
+class Control:
+    """A pretend control."""
+
+    def __init__(self, node, children=()):
+        self.tag = node.tag
+        self.text = node.text
+        self.children = list(children)
+
+
+class MyXMLParser(XMLParser):
+
+    schemas = {
+        **XMLParser.schemas,
+        'text': (Attribute('size', type=int, default=0),)
+    }
+
+    settings = ['width', 'height']
+
+    def get_servers(self, frame):
+        return [dict(name='Google', port=80), dict(name='BBC', port=443)]
+
+    def parse_row(self, node, frame):
+        return Control(
+            node, [self.parse_node(child, frame) for child in node]
+        )
+
+    def parse_label(self, node, frame):
+        return Control(node)
+
+    def parse_text(self, node, frame):
+        return Control(node)
+
+
+xml = MyXMLParser()
+
+
+def test_template():
+    root = fromstring(rows_code)[0]
+    template = RepeatTemplate(root, 'setting')
+    nodes = list(template.expand(['first', 'second']))
+    assert [node.tag for node in nodes] == ['row', 'row']
+    assert nodes[0].attrib == dict(name='row_0')
+    assert nodes[1].attrib == dict(name='row_1')
+    label, text = nodes[1]
+    assert label.text == 'second'
+    assert text.attrib == dict(name='value_second')
+    assert text.text == '1'
+
+
+def test_template_unknown_placeholder():
+    root = Element('repeat')
+    child = Element('label')
+    child.text = '$item costs $$5 ($missing)'
+    root.append(child)
+    template = RepeatTemplate(root)
+    node, = template.expand(['Tea'])
+    assert node.text == 'Tea costs $5 ($missing)'
+
+
+def test_repeat():
+    frame = DummyFrame()
+    xml.populate_from_string(rows_code, frame)
+    assert len(frame.rows) == 2
+    assert frame.rows == [frame.row_0, frame.row_1]
+    assert [row.children[0].text for row in frame.rows] == xml.settings
+    assert frame.value_width.text == '0'
+    assert frame.value_height.text == '1'
+    assert frame.rows[1].children[1] is frame.value_height
+
+
+def test_repeat_mapping():
+    frame = DummyFrame()
+    xml.populate_from_string(mapping_code, frame)
+    assert frame.server_0.text == 'Google (80)'
+    assert frame.server_1.text == 'BBC (443)'
+
+
+def test_repeat_data():
+    frame = DummyFrame()
+    xml.populate_from_string(
+        rows_code, frame, data=dict(settings=['depth'], unused=[])
+    )
+    assert len(frame.rows) == 1
+    assert frame.value_depth.text == '0'
+    assert xml.repeat_data is None
+    frame = DummyFrame()
+    xml.populate_from_string(rows_code, frame, data=dict(unused=[]))
+    assert len(frame.rows) == 2
+
+
+def test_repeat_data_callable():
+    frame = DummyFrame()
+    xml.populate_from_string(
+        rows_code, frame, data=dict(settings=lambda f: [type(f).__name__])
+    )
+    assert frame.value_DummyFrame.text == '0'
+
+
+def test_repeat_empty():
+    frame = DummyFrame()
+    parser = MyXMLParser()
+    parser.settings = []
+    parser.populate_from_string(rows_code, frame)
+    assert frame.rows == []
+
+
+def test_template_cached():
+    root = fromstring(rows_code)[0]
+    assert xml.get_template(root) is xml.get_template(root)
+
+
+def test_repeat_no_over():
+    with raises(MissingAttributeError):
+        xml.parse_node(Element('repeat'), DummyFrame())
+
+
+def test_converted_shared():
+    root = Element('repeat', over='settings')
+    root.append(Element('text', name='static', size='5'))
+    root.append(Element('text', size='$index'))
+    template = xml.get_template(root)
+    nodes = list(template.expand(['first', 'second']))
+    assert all(isinstance(node, StampedElement) for node in nodes)
+    first_static, first_dynamic, second_static, second_dynamic = nodes
+    assert first_static.converted is second_static.converted
+    assert first_dynamic.converted is None
+    a = xml.get_attributes(first_static)
+    assert a == dict(size=5)
+    assert xml.get_attributes(second_static) is a
+    assert xml.get_attributes(first_dynamic) == dict(size=0)
+    assert xml.get_attributes(second_dynamic) == dict(size=1)
+
+
+def test_nested():
+    frame = DummyFrame()
+    xml.populate_from_string(
+        nested_code, frame, data=dict(outer=['O1', 'O2'], inner=['I1', 'I2'])
+    )
+    assert len(frame.groups) == 2
+    assert frame.groups[1].children[0].text == 'O2'
+    assert [c.text for c in frame.cells_0] == ['I1/0 ($5)', 'I2/1 ($5)']
+    assert frame.cells_1 == [frame.cell_1_0, frame.cell_1_1]
+    assert frame.cell_1_1.text == 'I2/1 ($5)'
+
+
+def test_nested_as():
+    frame = DummyFrame()
+    xml.populate_from_string(
+        nested_as_code, frame, data=dict(outer=['A', 'B'], inner=['x', 'y'])
+    )
+    assert [
+        getattr(frame, 'label_%d_%d' % (x, y)).text
+        for x in range(2) for y in range(2)
+    ] == ['A/x/0', 'A/y/1', 'B/x/0', 'B/y/1']
@@ -1,13 +1,17 @@
 """Test the wx stuff."""
 
+import gc
+import os
+import weakref
 from pytest import raises
-from xml.etree.ElementTree import Element
+from xml.etree.ElementTree import Element, fromstring, parse
 import wx
 from wx.lib.intctrl import IntCtrl
 from wx.lib.agw.floatspin import FloatSpin
+from xmlui.exc import AttributeConversionError
 from xmlui.wx import (
     WXXMLParser, DuplicateSizerError, NoParent, no_parent, NoValueError,
-    InvalidTagError
+    InvalidTagError, VirtualListBox
 )
 
 app = wx.App()  # Keep wx happy.
@@ -22,6 +26,29 @@ duplicate_sizers_code = """
 </frame>
 """
 
+invalid_attribute_code = """
+<frame>
+    <sizer orient="vertical">
+        <sizer>
+            <slider min="low"></slider>
+        </sizer>
+    </sizer>
+</frame>
+"""
+
+repeat_code = """
+<frame>
+    <sizer orient="vertical">
+        <repeat over="settings" name="rows">
+            <sizer>
+                <label>$item</label>
+                <text name="setting" sizer_proportion="1">$index</text>
+            </sizer>
+        </repeat>
+    </sizer>
+</frame>
+"""
+
 
 def test_no_parent():
     assert isinstance(no_parent, NoParent)
@@ -347,3 +374,143 @@ def test_table_with_columns():
             assert c.GetItem(x, y).Text == words[y]
     assert c.GetFocusedItem() == int(value.text)
     f.Destroy()
+
+
+def test_invalid_attribute():
+    f = wx.Frame(None)
+    with raises(AttributeConversionError) as exc:
+        xml.populate_from_string(invalid_attribute_code, f)
+    assert exc.value.name == 'min'
+    assert exc.value.path == ['sizer', 'sizer', 'slider']
+    f.Destroy()
+
+
+def test_table_style_not_consumed():
+    root = Element('table', style='lc_report')
+    f = wx.Frame(None)
+    c = xml.parse_node(root, f, f, None)
+    assert c.HasFlag(wx.LC_REPORT)
+    assert root.attrib['style'] == 'lc_report'
+    f.Destroy()
+
+
+def test_repeat():
+    class RepeatXMLParser(WXXMLParser):
+        settings = ['First', 'Second', 'Third']
+
+    f = wx.Frame(None)
+    RepeatXMLParser().populate_from_string(repeat_code, f)
+    assert len(f.rows) == 3
+    assert all(isinstance(row, wx.BoxSizer) for row in f.rows)
+    assert len(f.GetSizer().GetChildren()) == 3
+    assert f.setting_1.GetValue() == '1'
+    label = f.rows[2].GetChildren()[0].Window
+    assert label.GetLabel() == 'Third'
+    f.Destroy()
+
+
+def test_grid():
+    root = Element('grid', rows='2', cols='3', vgap='4', hgap='5')
+    f = wx.Frame(None)
+    s = xml.parse_grid(root, f, f, None)
+    assert isinstance(s, wx.GridSizer)
+    assert s.GetRows() == 2
+    assert s.GetCols() == 3
+    assert s.GetVGap() == 4
+    assert s.GetHGap() == 5
+    f.Destroy()
+
+
+def test_flexgrid():
+    root = Element('flexgrid', growable_cols='1', growable_rows='0')
+    root.extend([Element('label'), Element('text')])
+    f = wx.Frame(None)
+    s = xml.parse_flexgrid(root, f, f, None)
+    assert isinstance(s, wx.FlexGridSizer)
+    assert s.GetCols() == 2
+    assert s.IsColGrowable(1)
+    assert not s.IsColGrowable(0)
+    assert s.IsRowGrowable(0)
+    assert len(s.GetChildren()) == 2
+    f.Destroy()
+
+
+def test_optimize_layout():
+    class OptimizingXMLParser(WXXMLParser):
+        optimize_layout = True
+
+    parser = OptimizingXMLParser()
+    f = wx.Frame(None)
+    filename = os.path.join(
+        os.path.dirname(os.path.dirname(__file__)), 'frame.xml'
+    )
+    root = parse(filename).getroot()
+    parser.populate_from_root(root, f)
+    assert parser.layouts[root] is not root
+    main_sizer = f.main_sizer
+    grid = main_sizer.GetChildren()[0].Sizer
+    assert isinstance(grid, wx.FlexGridSizer)
+    assert len(grid.GetChildren()) == 14
+    assert f.username.GetContainingSizer() is grid
+    f.Destroy()
+
+
+def test_optimize_layout_unchanged():
+    class OptimizingXMLParser(WXXMLParser):
+        optimize_layout = True
+
+    parser = OptimizingXMLParser()
+    f = wx.Frame(None)
+    root = fromstring(repeat_code)
+    parser.populate_from_root(root, f, data=dict(settings=['First']))
+    assert parser.layouts[root] is None
+    ref = weakref.ref(root)
+    del root
+    gc.collect()
+    assert ref() is None
+    assert not parser.layouts
+    f.Destroy()
+
+
+def test_virtual_list():
+    root = Element('list', virtual='1', choices='Zebra, apple, Banana')
+    root.text = '1'
+    f = wx.Frame(None)
+    c = xml.parse_node(root, f, f, None)
+    assert isinstance(c, VirtualListBox)
+    assert c.HasFlag(wx.LC_VIRTUAL)
+    assert c.GetCount() == 3
+    assert c.GetItemCount() == 3
+    assert c.GetStrings() == ['Zebra', 'apple', 'Banana']
+    assert c.GetSelection() == 1
+    assert c.GetStringSelection() == 'apple'
+    assert c.FindString('b') == wx.NOT_FOUND
+    assert c.FindString('banana') == 2
+    assert c.FindString('banana', caseSensitive=True) == wx.NOT_FOUND
+    assert c.FindString('Banana', caseSensitive=True) == 2
+    assert c.find_prefix('b') == 2
+    assert c.find_prefix('q') == wx.NOT_FOUND
+    c.SetSelection(wx.NOT_FOUND)
+    assert c.GetSelection() == wx.NOT_FOUND
+    c.SetWindowStyle(wx.BORDER_NONE)
+    assert c.HasFlag(wx.LC_VIRTUAL)
+    f.Destroy()
+
+
+def test_set_items():
+    f = wx.Frame(None)
+    items = ['Item %d' % x for x in range(1000)]
+    for tag in ('choice', 'list'):
+        c = xml.parse_node(Element(tag, choices='First'), f, f, None)
+        xml.set_items(c, items)
+        assert c.GetStrings() == items
+        xml.append_items(c, ['Last'])
+        assert c.GetCount() == 1001
+        assert c.GetString(1000) == 'Last'
+    c = xml.parse_node(Element('list', virtual='1'), f, f, None)
+    xml.set_items(c, iter(items))
+    assert c.GetItemCount() == 1000
+    xml.append_items(c, ['Last'])
+    assert c.GetItemCount() == 1001
+    assert c.GetItemText(1000) == 'Last'
+    f.Destroy()
@@ -1,26 +1,125 @@
 """XMLUI: Build user interfaces from XML files.
 By default uses wxpython."""
 
+import os
+from contextlib import contextmanager
+from functools import partial
+from weakref import WeakKeyDictionary
 from xml.etree.ElementTree import fromstring, parse
-from .exc import NoParserError
+from .exc import NoParserError, AttributeConversionError, MissingAttributeError
+from .include import fragment_cache
+from .repeat import RepeatTemplate, StampedElement
+
+
+class NoParent:
+    """Used to specify a default panel should not be created."""
+
+    def __str__(self):
+        return 'No Parent'
+
+    def __repr__(self):
+        return str(self)
+
+
+no_parent = NoParent()
+
+
+class Attribute:
+    """Describes how a single attribute should be converted.
+
+    name: The name of the attribute as it appears in the XML.
+    type: Either a callable which will be passed the attribute as a string, or
+    the name of a method on the parser (like 'get_flags') which will be used
+    instead.
+    default: The value to use when the attribute is missing. This value is not
+    converted.
+    required: If True, MissingAttributeError will be raised when the attribute
+    is missing.
+    list: If True, the attribute is split with XMLParser.get_list, and type is
+    applied to each entry.
+    key: The key the converted value is stored under. Defaults to name."""
+
+    __slots__ = ('name', 'type', 'default', 'required', 'list', 'key')
+
+    def __init__(
+        self, name, type=str, default=None, required=False, list=False,
+        key=None
+    ):
+        self.name = name
+        self.type = type
+        self.default = default
+        self.required = required
+        self.list = list
+        if key is None:
+            key = name
+        self.key = key
+
+    def __repr__(self):
+        return '%s(%r, type=%r)' % (type(self).__name__, self.name, self.type)
 
 
 class XMLParser:
     """Add controls coded as XML to a frame."""
 
+    # A dictionary of tag: attributes pairs, where attributes is a sequence of
+    # Attribute instances describing the attributes that tag accepts.
+    schemas = {
+        'repeat': (
+            Attribute('over', required=True),
+            Attribute('as', default='item')
+        )
+    }
+
+    # The cache used to load included files. Shared between all parsers by
+    # default.
+    fragments = fragment_cache
+
+    # A dictionary of tag: converter pairs, created by get_converter.
+    converters = None
+
+    # A WeakKeyDictionary of repeat node: RepeatTemplate pairs, created by
+    # get_template.
+    templates = None
+
+    # The data dictionary passed to the populate_from_root call in progress.
+    # Used by get_data.
+    repeat_data = None
+
     def populate_from_string(self, string, *args, **kwargs):
-        """Populate a frame from a string containing XML."""
-        root = fromstring(string)
-        return self.populate_from_root(root, *args, **kwargs)
+        """Populate a frame from a string containing XML.
+
+        Include tags are resolved relative to the current directory."""
+        return self.populate_from_root(fromstring(string), *args, **kwargs)
 
     def populate_from_file(self, f, *args, **kwargs):
         """Uses ElementTree.parse to load xml before calling
-        populate_from_root."""
-        tree = parse(f)
-        root = tree.getroot()
+        populate_from_root.
+
+        If f is a filename, the expanded document is cached by
+        self.fragments, so subsequent calls will not parse it again."""
+        if isinstance(f, str):
+            root = self.fragments.get(f)
+        else:
+            tree = parse(f)
+            name = getattr(f, 'name', None)
+            if isinstance(name, str):
+                directory = os.path.dirname(os.path.abspath(name))
+            else:
+                directory = None
+            root = self.expand_includes(tree.getroot(), directory=directory)
         return self.populate_from_root(root, *args, **kwargs)
 
-    def populate_from_root(self, root, frame, *args, **kwargs):
+    def expand_includes(self, root, directory=None):
+        """Return root with all include tags replaced by the contents of the
+        files they name. If directory is None, the current directory is
+        used.
+
+        If root contains no include tags, it is returned as it is."""
+        if directory is None:
+            directory = os.getcwd()
+        return self.fragments.expand(root, directory)[0]
+
+    def populate_from_root(self, root, frame, *args, data=None, **kwargs):
         """Given an XML tree starting at root, parses all tags using methods
         defined on this class as parse_tag - where tag is the name of a tag to
         parse - and populates the given frame with them.
@@ -28,9 +127,32 @@ class XMLParser:
         A special method parse_node is used to parse nodes.
 
         If necessary, a parse_* method should be prepared to recurse through
-        any subnodes as appropriate."""
-        for node in root:
-            self.parse_node(node, frame, *args, **kwargs)
+        any subnodes as appropriate.
+
+        Any include tags in root are expanded first, relative to the current
+        directory.
+
+        data is an optional dictionary used by repeat tags. See get_data."""
+        root = self.expand_includes(root)
+        with self.populating(root, data):
+            for node in root:
+                self.parse_node(node, frame, *args, **kwargs)
+
+    @contextmanager
+    def populating(self, root, data=None):
+        """Used by populate_from_root around parsing the children of root.
+
+        Makes data available to get_data until parsing has finished, and adds
+        the positions of top level nodes to AttributeConversionError paths."""
+        previous = self.repeat_data
+        self.repeat_data = data
+        try:
+            yield
+        except AttributeConversionError as e:
+            e.locate(root)
+            raise
+        finally:
+            self.repeat_data = previous
 
     def get_list(self, text, start=None, function=int):
         """Takes text line "5, 4" and returns [5, 4]."""
@@ -40,14 +162,133 @@ class XMLParser:
             start.append(function(entry.strip()))
         return start
 
+    def compile_schema(self, attributes):
+        """Given a sequence of Attribute instances, return a function which
+        takes a node and returns a dictionary of converted attributes.
+
+        All method lookups are performed here, so the returned function does
+        as little work as possible.
+
+        The returned dictionary may be shared between nodes created by the
+        repeat tag, and should not be modified."""
+        entries = []
+        for attribute in attributes:
+            function = attribute.type
+            if isinstance(function, str):
+                function = getattr(self, function)
+            if attribute.list:
+                function = partial(self.get_list, function=function)
+            entries.append(
+                (
+                    attribute.name, attribute.key, function, attribute.default,
+                    attribute.required
+                )
+            )
+        entries = tuple(entries)
+
+        def convert(node):
+            if node.__class__ is StampedElement:
+                converted = node.converted
+                if converted is not None:
+                    # Every element created by this stamp has the same
+                    # attributes, so only convert them once.
+                    try:
+                        return converted[convert]
+                    except KeyError:
+                        res = convert_node(node)
+                        converted[convert] = res
+                        return res
+            return convert_node(node)
+
+        def convert_node(node):
+            a = node.attrib
+            res = {}
+            for name, key, function, default, required in entries:
+                value = a.get(name, None)
+                if value is None:
+                    if required:
+                        raise MissingAttributeError(node, name)
+                    res[key] = default
+                else:
+                    try:
+                        res[key] = function(value)
+                    except (ValueError, TypeError, AttributeError) as e:
+                        raise AttributeConversionError(
+                            node, name, value
+                        ) from e
+            return res
+
+        return convert
+
+    def get_converter(self, tag):
+        """Get the compiled converter for the given tag, compiling it from
+        self.schemas if necessary."""
+        converters = self.converters
+        if converters is None:
+            converters = self.converters = {}
+        try:
+            return converters[tag]
+        except KeyError:
+            converter = self.compile_schema(self.schemas.get(tag, ()))
+            converters[tag] = converter
+            return converter
+
+    def get_attributes(self, node):
+        """Return the attributes of node, converted according to the schema for
+        its tag."""
+        return self.get_converter(node.tag)(node)
+
     def parse_node(self, node, frame, *args, **kwargs):
         """Parses a single node."""
         func = getattr(self, f'parse_{node.tag}', None)
         if func is None:
             raise NoParserError(node.tag)
-        res = func(node, frame, *args, **kwargs)
+        try:
+            res = func(node, frame, *args, **kwargs)
+        except AttributeConversionError as e:
+            if e.nodes[0] is not node:
+                e.add_parent(node)
+            raise
         a = node.attrib
         name = a.get('name', None)
         if name is not None:
             setattr(frame, name, res)
         return res
+
+    def get_data(self, name, frame):
+        """Get the data named by the over attribute of a repeat tag.
+
+        If a data dictionary containing name was passed to
+        populate_from_root, the value from that dictionary is used.
+        Otherwise the data is got with getattr(self, name). If the result is
+        callable, it is called with frame as the only argument."""
+        data = self.repeat_data
+        if data is not None and name in data:
+            data = data[name]
+        else:
+            data = getattr(self, name)
+        if callable(data):
+            data = data(frame)
+        return data
+
+    def get_template(self, node):
+        """Return the compiled RepeatTemplate for the given repeat node,
+        compiling it if necessary."""
+        templates = self.templates
+        if templates is None:
+            templates = self.templates = WeakKeyDictionary()
+        try:
+            return templates[node]
+        except KeyError:
+            template = RepeatTemplate(node, self.get_attributes(node)['as'])
+            templates[node] = template
+            return template
+
+    def parse_repeat(self, node, frame, *args, **kwargs):
+        """Parse the children of node once for every item in the data named
+        by the over attribute, returning a list of the results."""
+        data = self.get_data(self.get_attributes(node)['over'], frame)
+        return [
+            self.parse_node(child, frame, *args, **kwargs)
+            for child in self.get_template(node).expand(data)
+        ]
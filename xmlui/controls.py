@@ -0,0 +1,108 @@
+"""Provides the ControlsXMLParser class, which holds everything the wx and
+headless backends have in common."""
+
+from .base import XMLParser, Attribute
+from .exc import NoValueError
+
+
+def get_schemas(flag):
+    """Return the schemas for the tags supported by both backends.
+
+    flag is called with the upper case name of a flag (like 'GROW'), and
+    should return the value used as the default for attributes which are
+    converted with get_flags."""
+    return {
+        '*': (
+            Attribute('label'),
+            Attribute('style', type='get_flags'),
+            Attribute('size', type=int, list=True),
+            Attribute('sizer_proportion', type=int, default=0),
+            Attribute('sizer_flag', type='get_flags', default=flag('GROW')),
+            Attribute('bind')
+        ),
+        'sizer': (
+            Attribute(
+                'orient', type='get_flags', default=flag('HORIZONTAL')
+            ),
+        ),
+        'grid': (
+            Attribute('rows', type=int, default=0),
+            Attribute('cols', type=int, default=2),
+            Attribute('vgap', type=int, default=0),
+            Attribute('hgap', type=int, default=0)
+        ),
+        'flexgrid': (
+            Attribute('rows', type=int, default=0),
+            Attribute('cols', type=int, default=2),
+            Attribute('vgap', type=int, default=0),
+            Attribute('hgap', type=int, default=0),
+            Attribute('growable_rows', type=int, list=True, default=()),
+            Attribute('growable_cols', type=int, list=True, default=())
+        ),
+        'integer': (
+            Attribute('min', type=int),
+            Attribute('max', type=int),
+            Attribute('limited', type=int, default=0),
+            Attribute('allow_none', type=int, default=0),
+            Attribute('allow_long', type=int, default=0)
+        ),
+        'float': (
+            Attribute('min', type=float),
+            Attribute('max', type=float),
+            Attribute('increment', type=float, default=1.0),
+            Attribute('digits', type=int, default=-1)
+        ),
+        'slider': (
+            Attribute('min', type=int, default=0),
+            Attribute('max', type=int, default=100)
+        ),
+        'button': (Attribute('default', type=int, default=0),),
+        'choice': (Attribute('choices', list=True),),
+        'list': (
+            Attribute('choices', list=True),
+            Attribute('virtual', type=int, default=0)
+        ),
+        'table': (
+            Attribute('style', type='get_flags', default=flag('LC_ICON')),
+        ),
+        'column': (
+            Attribute(
+                'format', type='get_flags',
+                default=flag('LIST_FORMAT_LEFT')
+            ),
+            Attribute('width', type=int, default=-1)
+        )
+    }
+
+
+class ControlsXMLParser(XMLParser):
+    """The base class for xmlui.wx.WXXMLParser and
+    xmlui.headless.HeadlessXMLParser.
+
+    Subclasses should add the result of get_schemas to their schemas, and
+    provide a get_flags method."""
+
+    # Tags which apply the style attribute themselves when creating their
+    # controls.
+    styled_tags = frozenset(['table'])
+
+    # Tags whose results should be returned without being labelled, styled or
+    # added to a sizer. The repeat tag adds its own children to the sizer.
+    transparent_tags = frozenset(['repeat'])
+
+    def parse_value(self, node, frame, parent, sizer):
+        """Get a value as an integer."""
+        return int(node.text)
+
+    def parse_column(self, node, frame, parent, sizer):
+        """Return a tuple of (heading, format, width), which can be sent to
+        wx.ListCtrl.AppendColumn."""
+        heading = node.text
+        if heading is None:
+            raise NoValueError(node)
+        a = self.get_attributes(node)
+        return (heading, a['format'], a['width'])
+
+    def parse_item(self, node, frame, parent, sizer):
+        """Parse a list item."""
+        return self.get_list(node.text, function=str)
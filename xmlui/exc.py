@@ -3,3 +3,73 @@
 
 class NoParserError(Exception):
     """Don't know how to parse this tag."""
+
+
+class DuplicateSizerError(Exception):
+    """There is already a main sizer."""
+
+
+class InvalidTagError(Exception):
+    """Invalid tag found."""
+
+
+class NoValueError(Exception):
+    """No value was provided where one should be."""
+
+
+class AttributeConversionError(Exception):
+    """An attribute could not be converted to the type given in its schema.
+
+    The path attribute lists the tags of all the nodes between the root of the
+    document and the node which could not be converted. If a node has siblings
+    with the same tag, its position among them (starting from 1) is given too,
+    like sizer[5]. The nodes themselves are stored in the nodes attribute."""
+
+    def __init__(self, node, name, value):
+        super().__init__(node, name, value)
+        self.node = node
+        self.name = name
+        self.value = value
+        self.nodes = [node]
+        self.path = [node.tag]
+
+    def locate(self, parent):
+        """Add the position of the first node in self.nodes among the
+        children of parent to the start of the path, if it has any siblings
+        with the same tag."""
+        node = self.nodes[0]
+        siblings = [child for child in parent if child.tag == node.tag]
+        if len(siblings) > 1:
+            for position, sibling in enumerate(siblings, start=1):
+                if sibling is node:
+                    self.path[0] = '%s[%d]' % (node.tag, position)
+                    break
+
+    def add_parent(self, parent):
+        """Add parent to the start of the path."""
+        self.locate(parent)
+        self.nodes.insert(0, parent)
+        self.path.insert(0, parent.tag)
+
+    def __str__(self):
+        return '%s@%s: Could not convert %r.' % (
+            '/'.join(self.path), self.name, self.value
+        )
+
+
+class MissingAttributeError(AttributeConversionError):
+    """A required attribute was not provided."""
+
+    def __init__(self, node, name):
+        super().__init__(node, name, None)
+
+    def __str__(self):
+        return '%s@%s: Attribute is required.' % (
+            '/'.join(self.path), self.name
+        )
+
+
+class IncludeCycleError(Exception):
+    """A file includes itself, either directly or indirectly.
+
+    The arguments are the chain of filenames which make up the cycle."""
@@ -0,0 +1,238 @@
+"""Provides the HeadlessXMLParser class, which records controls instead of
+creating them."""
+
+from .base import no_parent
+from .controls import ControlsXMLParser, get_schemas
+from .exc import DuplicateSizerError, InvalidTagError
+
+# Tags which create sizers.
+sizer_tags = frozenset(['sizer', 'grid', 'flexgrid'])
+
+
+class Control:
+    """A record of a control that would have been created.
+
+    tag: The name of the tag which created this control.
+    value: The value of the control, as given by the text of the node.
+    options: The converted attributes of the node.
+    children: A list of the controls added to this control, if it is a sizer,
+    otherwise None.
+
+    The rest of the attributes are set by parse_node, and are None unless the
+    relevant attributes were provided."""
+
+    __slots__ = (
+        'tag', 'value', 'options', 'children', 'label', 'style', 'size',
+        'proportion', 'flag', 'binders'
+    )
+
+    def __init__(self, tag, value=None, options=None):
+        self.tag = tag
+        self.value = value
+        self.options = options
+        if tag in sizer_tags:
+            self.children = []
+        else:
+            self.children = None
+        self.label = None
+        self.style = None
+        self.size = None
+        self.proportion = None
+        self.flag = None
+        self.binders = None
+
+    def __repr__(self):
+        return '%s(%r, value=%r)' % (type(self).__name__, self.tag, self.value)
+
+
+class HeadlessFrame:
+    """Stands in for a frame.
+
+    title: The title set by the title tag.
+    sizer: The main sizer.
+    controls: A list of every control recorded, in the order they were
+    created."""
+
+    def __init__(self):
+        self.title = None
+        self.sizer = None
+        self.controls = []
+
+
+class HeadlessXMLParser(ControlsXMLParser):
+    """Populate HeadlessFrame instances from XML.
+
+    Supports the same tags as xmlui.wx.WXXMLParser, but only records Control
+    instances, so it can be used without wx or a display. Flags are recorded
+    as tuples of upper case names, rather than being looked up on the wx
+    module."""
+
+    schemas = {
+        **ControlsXMLParser.schemas, **get_schemas(lambda name: (name,))
+    }
+
+    def populate_from_root(self, root, frame, parent=no_parent, data=None):
+        """Populate frame, which should be a HeadlessFrame instance.
+
+        If parent is None, a panel control is recorded, and used as the
+        parent. Otherwise parent is passed through to all the parse_* methods
+        in the same way as WXXMLParser.populate_from_root, although no
+        parse_* method uses it.
+
+        data is used by repeat tags, as in XMLParser.populate_from_root."""
+        root = self.expand_includes(root)
+        sizer = None
+        if parent is no_parent:
+            parent = frame
+        elif parent is None:
+            parent = Control('panel')
+            frame.controls.append(parent)
+        with self.populating(root, data):
+            for node in root:
+                res = self.parse_node(node, frame, parent, sizer)
+                if isinstance(res, Control) and res.tag in sizer_tags:
+                    if sizer is not None:
+                        raise DuplicateSizerError(
+                            'Sizer %r is the second sizer (first was %r).' % (
+                                res, sizer
+                            )
+                        )
+                    sizer = res
+        frame.sizer = sizer
+
+    def get_flags(self, text, default=()):
+        """Given a string like "te_rich2,te_password", return
+        default + ('TE_RICH2', 'TE_PASSWORD')."""
+        return default + tuple(
+            entry.strip() for entry in text.upper().split(',')
+        )
+
+    def set_items(self, control, items):
+        """Replace the choices of control."""
+        control.options = dict(control.options, choices=list(items))
+
+    def append_items(self, control, items):
+        """Add items to the end of the choices of control."""
+        choices = control.options['choices'] or []
+        self.set_items(control, choices + list(items))
+
+    def parse_node(self, node, frame, parent, sizer):
+        """Parse a single node."""
+        res = super().parse_node(node, frame, parent, sizer)
+        if res is None or node.tag in self.transparent_tags:
+            return res
+        frame.controls.append(res)
+        a = self.get_converter('*')(node)
+        res.label = a['label']
+        if node.tag not in self.styled_tags:
+            res.style = a['style']
+        res.size = a['size']
+        if sizer is not None:
+            res.proportion = a['sizer_proportion']
+            res.flag = a['sizer_flag']
+            sizer.children.append(res)
+        binders = a['bind']
+        if binders is not None:
+            res.binders = []
+            for binder in binders.split(','):
+                event_name, func_name = binder.split(':')
+                res.binders.append(
+                    (event_name.strip().upper(), getattr(self, func_name))
+                )
+        return res
+
+    def parse_title(self, node, frame, parent, sizer):
+        """Set the title of frame."""
+        frame.title = node.text
+
+    def parse_sizer(self, node, frame, parent, sizer):
+        """Record a sizer and all contained nodes."""
+        s = Control(node.tag, options=self.get_attributes(node))
+        for child in node:
+            self.parse_node(child, frame, parent, s)
+        return s
+
+    parse_grid = parse_sizer
+    parse_flexgrid = parse_sizer
+
+    def parse_label(self, node, frame, parent, sizer):
+        """Record a label."""
+        return Control(node.tag, value=node.text)
+
+    def parse_text(self, node, frame, parent, sizer):
+        """Record a text control."""
+        return Control(node.tag, value=node.text or '')
+
+    def parse_integer(self, node, frame, parent, sizer):
+        """Record a control that accepts integers."""
+        value = node.text
+        if value is None:
+            value = 0
+        else:
+            value = int(value)
+        return Control(
+            node.tag, value=value, options=self.get_attributes(node)
+        )
+
+    def parse_float(self, node, frame, parent, sizer):
+        """Record a float control."""
+        if node.text is None:
+            value = 0.0
+        else:
+            value = float(node.text)
+        return Control(
+            node.tag, value=value, options=self.get_attributes(node)
+        )
+
+    def parse_slider(self, node, frame, parent, sizer):
+        """Record a slider control."""
+        if node.text is None:
+            value = 0
+        else:
+            value = int(node.text)
+        return Control(
+            node.tag, value=value, options=self.get_attributes(node)
+        )
+
+    def parse_checkbox(self, node, frame, parent, sizer):
+        """Record a checkbox."""
+        if node.text is None:
+            value = False
+        else:
+            value = bool(int(node.text))
+        return Control(node.tag, value=value)
+
+    def parse_button(self, node, frame, parent, sizer):
+        """Record a button."""
+        return Control(node.tag, options=self.get_attributes(node))
+
+    def parse_choice(self, node, frame, parent, sizer):
+        """Record a popup button. The value is the selected index, or None."""
+        value = node.text
+        if value is not None:
+            value = int(value)
+        return Control(
+            node.tag, value=value, options=self.get_attributes(node)
+        )
+
+    parse_list = parse_choice
+
+    def parse_table(self, node, frame, parent, sizer):
+        """Record a list control with columns. The columns and items are
+        stored in the options dictionary."""
+        columns = []
+        items = []
+        value = None
+        for tag in node:
+            if tag.tag == 'value':
+                value = self.parse_value(tag, frame, parent, sizer)
+            elif tag.tag == 'column':
+                columns.append(self.parse_column(tag, frame, parent, sizer))
+            elif tag.tag == 'item':
+                items.append(self.parse_item(tag, frame, parent, sizer))
+            else:
+                raise InvalidTagError(tag)
+        options = dict(
+            self.get_attributes(node), columns=columns, items=items
+        )
+        return Control(node.tag, value=value, options=options)
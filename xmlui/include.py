@@ -0,0 +1,220 @@
+"""Provides the FragmentCache class, used for expanding include tags."""
+
+import os
+from hashlib import sha1
+from string import Template
+from xml.etree.ElementTree import Element, fromstring
+from .exc import IncludeCycleError, MissingAttributeError
+
+
+def substitute(node, mapping):
+    """Return a copy of node, with $name placeholders in its text, tail and
+    attributes replaced using mapping. Unknown placeholders are left alone."""
+    copy = Element(
+        node.tag, {
+            name: Template(value).safe_substitute(mapping)
+            for name, value in node.attrib.items()
+        }
+    )
+    if node.text is not None:
+        copy.text = Template(node.text).safe_substitute(mapping)
+    if node.tail is not None:
+        copy.tail = Template(node.tail).safe_substitute(mapping)
+    for child in node:
+        copy.append(substitute(child, mapping))
+    return copy
+
+
+def add_tail(node, tail):
+    """Add tail to the text following the last child of node, or to the text
+    of node if it has no children.
+
+    The last child may be shared, so it is replaced with a copy, which shares
+    its children."""
+    if len(node):
+        last = node[-1]
+        copy = Element(last.tag, last.attrib)
+        copy.text = last.text
+        copy.tail = (last.tail or '') + tail
+        copy.extend(last)
+        node[-1] = copy
+    else:
+        node.text = (node.text or '') + tail
+
+
+class Fragment:
+    """A parsed file.
+
+    The root of a fragment may be shared between any number of documents, and
+    must never be modified."""
+
+    __slots__ = ('filename', 'mtime', 'digest', 'root', 'includes')
+
+    def __init__(self, filename, mtime, digest, root, includes):
+        self.filename = filename
+        self.mtime = mtime
+        self.digest = digest
+        self.root = root
+        self.includes = includes
+
+    def __repr__(self):
+        return '%s(%r)' % (type(self).__name__, self.filename)
+
+
+class Document:
+    """A fragment with all of its includes expanded.
+
+    dependencies is the set of filenames which were used to build root,
+    including the document's own filename."""
+
+    __slots__ = ('root', 'dependencies')
+
+    def __init__(self, root, dependencies):
+        self.root = root
+        self.dependencies = dependencies
+
+
+class FragmentCache:
+    """Parse files once, and expand include tags found within them.
+
+    Files are checked for modification each time they are used. If the mtime
+    of a file has changed, its contents are hashed, and only if the hash has
+    changed is the file reparsed. When that happens, only those documents
+    which depend on the changed file are thrown away."""
+
+    def __init__(self):
+        self.fragments = {}
+        self.documents = {}
+
+    def refresh(self, filename):
+        """Return an up to date Fragment instance for filename, parsing the
+        file if necessary."""
+        mtime = os.stat(filename).st_mtime_ns
+        fragment = self.fragments.get(filename, None)
+        if fragment is not None and fragment.mtime == mtime:
+            return fragment
+        with open(filename, 'rb') as f:
+            data = f.read()
+        digest = sha1(data).digest()
+        if fragment is not None and fragment.digest == digest:
+            fragment.mtime = mtime
+            return fragment
+        root = fromstring(data)
+        directory = os.path.dirname(filename)
+        includes = set()
+        for node in root.iter('include'):
+            includes.add(self.get_filename(node, directory))
+        fragment = Fragment(filename, mtime, digest, root, includes)
+        self.fragments[filename] = fragment
+        self.invalidate(filename)
+        return fragment
+
+    def invalidate(self, filename):
+        """Forget every document which depends on filename."""
+        for name, document in list(self.documents.items()):
+            if filename in document.dependencies:
+                del self.documents[name]
+
+    def get_filename(self, node, directory):
+        """Return the absolute filename referred to by the src attribute of
+        the given include node."""
+        src = node.attrib.get('src', None)
+        if src is None:
+            raise MissingAttributeError(node, 'src')
+        return os.path.abspath(os.path.join(directory, src))
+
+    def get(self, filename, stack=()):
+        """Return the root of filename, with all includes expanded.
+
+        The returned tree is shared, and must not be modified.
+
+        stack is the chain of filenames currently being expanded, and is used
+        to detect cycles."""
+        filename = os.path.abspath(filename)
+        if filename in stack:
+            raise IncludeCycleError(*stack, filename)
+        document = self.documents.get(filename, None)
+        if document is not None:
+            for name in document.dependencies:
+                self.refresh(name)
+            # Refreshing will have removed the document if anything changed.
+            document = self.documents.get(filename, None)
+        if document is None:
+            fragment = self.refresh(filename)
+            root, dependencies = self.expand(
+                fragment.root, os.path.dirname(filename), stack + (filename,)
+            )
+            dependencies.add(filename)
+            document = Document(root, frozenset(dependencies))
+            self.documents[filename] = document
+        return document.root
+
+    def expand(self, root, directory, stack=()):
+        """Expand all the include tags in the tree starting at root, resolving
+        filenames relative to directory.
+
+        Returns a tuple containing the expanded tree, and the set of filenames
+        which were included.
+
+        If root contains no include tags then it is returned as it is,
+        otherwise a new tree is built. Included nodes are only copied if they
+        need parameters substituting, so the new tree shares nodes with the
+        cache, and must not be modified."""
+        dependencies = set()
+        if next(root.iter('include'), None) is None:
+            return (root, dependencies)
+        return (self.expand_node(root, directory, stack, dependencies),
+                dependencies)
+
+    def expand_node(self, node, directory, stack, dependencies):
+        """Return a copy of node with all includes expanded, adding the
+        filenames of included files to dependencies."""
+        copy = Element(node.tag, node.attrib)
+        copy.text = node.text
+        copy.tail = node.tail
+        for child in node:
+            if child.tag != 'include':
+                if next(child.iter('include'), None) is not None:
+                    child = self.expand_node(
+                        child, directory, stack, dependencies
+                    )
+                copy.append(child)
+                continue
+            filename = self.get_filename(child, directory)
+            root = self.get(filename, stack)
+            dependencies.update(self.documents[filename].dependencies)
+            params = dict(child.attrib)
+            del params['src']
+            for included in root:
+                if params:
+                    included = substitute(included, params)
+                copy.append(included)
+            if child.tail:
+                add_tail(copy, child.tail)
+        return copy
+
+    def graph(self):
+        """Return a dictionary mapping the filename of every loaded file to
+        the set of filenames it includes directly."""
+        return {
+            filename: set(fragment.includes)
+            for filename, fragment in self.fragments.items()
+        }
+
+    def dependents(self, filename):
+        """Return the set of loaded files which include filename, either
+        directly or indirectly."""
+        filename = os.path.abspath(filename)
+        graph = self.graph()
+        res = set()
+        pending = [filename]
+        while pending:
+            target = pending.pop()
+            for name, includes in graph.items():
+                if target in includes and name not in res:
+                    res.add(name)
+                    pending.append(name)
+        return res
+
+
+fragment_cache = FragmentCache()
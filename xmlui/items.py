@@ -0,0 +1,77 @@
+"""Provides the CompactStrings class, for storing large numbers of items."""
+
+from array import array
+from itertools import accumulate, islice
+
+
+class CompactStrings:
+    """A sequence of strings, stored as one long string and an array of
+    offsets, rather than as one Python object per string.
+
+    Strings cannot be changed or removed, but can be added to the end with
+    extend. They can be searched by prefix with find."""
+
+    __slots__ = ('data', 'offsets', 'index')
+
+    def __init__(self, items=()):
+        self.data = ''
+        self.offsets = array('Q', [0])
+        # The positions of the strings, sorted case-insensitively. Built the
+        # first time find is called.
+        self.index = None
+        self.extend(items)
+
+    def extend(self, items):
+        """Add items to the end."""
+        items = list(items)
+        offsets = accumulate(map(len, items), initial=len(self.data))
+        # The first offset is already stored.
+        self.offsets.extend(islice(offsets, 1, None))
+        self.data += ''.join(items)
+        self.index = None
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, position):
+        size = len(self)
+        if position < 0:
+            position += size
+        if position < 0 or position >= size:
+            raise IndexError(position)
+        return self.data[self.offsets[position]:self.offsets[position + 1]]
+
+    def __iter__(self):
+        data = self.data
+        offsets = self.offsets
+        for position in range(len(self)):
+            yield data[offsets[position]:offsets[position + 1]]
+
+    def get_index(self):
+        """Return the positions of all the strings, sorted
+        case-insensitively."""
+        if self.index is None:
+            self.index = array(
+                'Q', sorted(range(len(self)), key=lambda i: self[i].lower())
+            )
+        return self.index
+
+    def find(self, prefix):
+        """Return the position of the first string (in alphabetical order)
+        which starts with prefix, ignoring case. If there is no such string,
+        return -1."""
+        prefix = prefix.lower()
+        index = self.get_index()
+        low = 0
+        high = len(index)
+        while low < high:
+            middle = (low + high) // 2
+            if self[index[middle]].lower() < prefix:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(index):
+            position = index[low]
+            if self[position].lower().startswith(prefix):
+                return position
+        return -1
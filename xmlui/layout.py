@@ -0,0 +1,150 @@
+"""Layout optimisations which work on trees before they are parsed."""
+
+from xml.etree.ElementTree import Element
+
+# Tags which may not create exactly one control, so cannot fill the second
+# cell of a row.
+irregular_tags = frozenset(['repeat', 'title', 'include'])
+
+# Attributes which would affect a label differently once it was moved from
+# a horizontal sizer into a grid.
+label_sizer_attributes = frozenset(['sizer_proportion', 'sizer_flag'])
+
+
+def is_row(node):
+    """Returns True if node is a horizontal sizer with no other attributes,
+    containing a label followed by exactly one control.
+
+    Labels with sizer_proportion or sizer_flag attributes are not allowed."""
+    if node.tag != 'sizer' or len(node) != 2:
+        return False
+    label, control = node
+    if (
+        label.tag != 'label' or control.tag in irregular_tags or
+        not label_sizer_attributes.isdisjoint(label.attrib)
+    ):
+        return False
+    a = node.attrib
+    if not a:
+        return True
+    return len(a) == 1 and a.get('orient', '').strip() == 'horizontal'
+
+
+def is_row_template(node):
+    """Returns True if node is an unnamed repeat tag whose only child is a
+    row."""
+    return (
+        node.tag == 'repeat' and 'name' not in node.attrib and
+        len(node) == 1 and is_row(node[0])
+    )
+
+
+def is_vertical(node):
+    """Returns True if node is a vertical sizer."""
+    return node.tag == 'sizer' and node.attrib.get(
+        'orient', ''
+    ).strip() == 'vertical'
+
+
+def make_grid(rows):
+    """Return a flexgrid node containing the contents of the given rows.
+
+    The second column is made growable if any of the controls in it had a
+    sizer_proportion, since that is what made them stretch before."""
+    grid = Element('flexgrid', cols='2')
+    growable = False
+    for row in rows:
+        if row.tag == 'repeat':
+            row = flatten_repeat(row)
+            grid.append(row)
+            control = row[1]
+        else:
+            label, control = row
+            grid.extend((label, control))
+        if control.attrib.get('sizer_proportion', '0').strip() != '0':
+            growable = True
+    if growable:
+        grid.set('growable_cols', '1')
+    return grid
+
+
+def flatten_repeat(node):
+    """Return a copy of the given repeat tag, with the contents of its row
+    moved up a level."""
+    copy = Element(node.tag, node.attrib)
+    copy.extend(node[0])
+    return copy
+
+
+def flatten_rows(root, min_rows=2):
+    """Return a tree where runs of at least min_rows label/control rows inside
+    vertical sizers have been replaced by a single flexgrid tag.
+
+    In other words, this:
+
+    <sizer orient="vertical">
+        <sizer>
+            <label>&amp;Username</label>
+            <text name="username" sizer_proportion="1"></text>
+        </sizer>
+        <sizer>
+            <label>&amp;Password</label>
+            <text name="password" sizer_proportion="1"></text>
+        </sizer>
+    </sizer>
+
+    Becomes:
+
+    <sizer orient="vertical">
+        <flexgrid cols="2" growable_cols="1">
+            <label>&amp;Username</label>
+            <text name="username" sizer_proportion="1"></text>
+            <label>&amp;Password</label>
+            <text name="password" sizer_proportion="1"></text>
+        </flexgrid>
+    </sizer>
+
+    Only rows whose sizers have no attributes (other than a horizontal
+    orientation) are flattened, so named sizers are never lost. Rows whose
+    second node is a repeat, title or include tag are left alone, as are rows
+    whose labels have sizer_proportion or sizer_flag attributes. An unnamed
+    repeat tag whose only child is such a row counts as a run on its own.
+
+    root is not modified. If nothing needs flattening, root itself is
+    returned, otherwise a new tree is returned which shares any unmodified
+    nodes with root."""
+    children = []
+    changed = False
+    for child in root:
+        new = flatten_rows(child, min_rows=min_rows)
+        if new is not child:
+            changed = True
+        children.append(new)
+    if is_vertical(root):
+        flattened = []
+        run = []
+        for child in children + [None]:
+            if child is not None and is_row(child):
+                run.append(child)
+                continue
+            if len(run) >= min_rows:
+                flattened.append(make_grid(run))
+                changed = True
+            else:
+                flattened.extend(run)
+            run = []
+            if child is None:
+                continue
+            if is_row_template(child):
+                flattened.append(make_grid([child]))
+                changed = True
+            else:
+                flattened.append(child)
+        children = flattened
+    if not changed:
+        return root
+    copy = Element(root.tag, root.attrib)
+    copy.text = root.text
+    copy.tail = root.tail
+    copy.extend(children)
+    return copy
@@ -0,0 +1,180 @@
+"""Provides the FramePool class, for reusing populated frames."""
+
+from collections import OrderedDict
+from functools import partial
+import wx
+from wx.lib.agw.floatspin import FloatSpin
+from wx.lib.intctrl import IntCtrl
+from .wx import no_parent, VirtualListBox
+
+
+def set_list_selection(control, index):
+    """Make index the only selected item in the given wx.ListCtrl, and focus
+    it. If index is wx.NOT_FOUND, clear the selection instead."""
+    selected = control.GetFirstSelected()
+    while selected != wx.NOT_FOUND:
+        control.Select(selected, on=0)
+        selected = control.GetNextSelected(selected)
+    if index != wx.NOT_FOUND:
+        control.Select(index)
+        control.Focus(index)
+
+
+class FramePool:
+    """Hide and reset frames instead of destroying them, so they can be reused
+    the next time the same layout is needed.
+
+    Layouts are identified by their root node and the data used to populate
+    them, so the trees returned by XMLParser.fragments are ideal: they stay
+    the same until the file they were loaded from changes.
+
+    parser: The WXXMLParser instance used to populate new frames.
+    factory: A function which returns a new frame or panel to populate.
+    Defaults to creating a wx.Frame with no parent.
+    max_size: The maximum number of hidden frames to keep. When there are
+    more, the least recently released frame is destroyed.
+
+    Closing the last shown top level window destroys the frame as normal, and
+    clears the pool, so that wx.App.MainLoop can exit. If the application
+    has a main window which was not created by the pool, call clear when it
+    closes."""
+
+    # A list of (class, getter, setter) tuples used to save and restore the
+    # values of controls. The getter and setter can be method names, or
+    # functions which take the control as their first argument. The first
+    # matching class is used, so subclasses should come before their bases.
+    resetters = [
+        (IntCtrl, 'GetValue', 'SetValue'),
+        (FloatSpin, 'GetValue', 'SetValue'),
+        (wx.TextCtrl, 'GetValue', 'ChangeValue'),
+        (wx.Slider, 'GetValue', 'SetValue'),
+        (wx.CheckBox, 'GetValue', 'SetValue'),
+        (wx.Choice, 'GetSelection', 'SetSelection'),
+        (wx.ListBox, 'GetSelection', 'SetSelection'),
+        (VirtualListBox, 'GetSelection', 'SetSelection'),
+        (wx.ListCtrl, 'GetFirstSelected', set_list_selection)
+    ]
+
+    def __init__(self, parser, factory=None, max_size=4):
+        self.parser = parser
+        if factory is None:
+            def factory():
+                return wx.Frame(None)
+        self.factory = factory
+        self.max_size = max_size
+        # Hidden frames, ordered from least to most recently released.
+        self.idle = OrderedDict()
+        self.keys = {}
+        self.snapshots = {}
+
+    def acquire(self, root, parent=no_parent, data=None):
+        """Return a frame populated from root, reusing a hidden one if
+        possible. parent and data are passed to
+        WXXMLParser.populate_from_root.
+
+        A hidden frame is only reused if it was populated with the same root
+        and equal data. Any values in data which are not callable are copied
+        into lists first, so later changes to them are noticed. Callable
+        values are compared by identity.
+
+        Frames created by the pool release themselves when closed, and are
+        forgotten if they are destroyed."""
+        if data is not None:
+            data = {
+                name: value if callable(value) else list(value)
+                for name, value in data.items()
+            }
+        key = (root, data)
+        for frame, (frame_root, frame_data) in reversed(self.idle.items()):
+            if frame_root is root and frame_data == data:
+                del self.idle[frame]
+                return frame
+        frame = self.factory()
+        self.parser.populate_from_root(root, frame, parent, data=data)
+        self.keys[frame] = key
+        self.snapshots[frame] = self.snapshot(frame)
+        frame.Bind(wx.EVT_CLOSE, self.on_close)
+        frame.Bind(wx.EVT_WINDOW_DESTROY, self.on_destroy)
+        return frame
+
+    def acquire_file(self, filename, parent=no_parent, data=None):
+        """Return a frame populated from filename, loaded with
+        self.parser.fragments."""
+        return self.acquire(
+            self.parser.fragments.get(filename), parent, data=data
+        )
+
+    def release(self, frame):
+        """Hide frame and reset all its controls, ready for reuse."""
+        frame.Hide()
+        for setter, value in self.snapshots[frame]:
+            setter(value)
+        self.idle[frame] = self.keys[frame]
+        while len(self.idle) > self.max_size:
+            oldest, key = self.idle.popitem(last=False)
+            self.forget(oldest)
+            oldest.Destroy()
+
+    def forget(self, frame):
+        """Stop tracking frame, without destroying it."""
+        self.idle.pop(frame, None)
+        del self.keys[frame]
+        del self.snapshots[frame]
+
+    def clear(self):
+        """Destroy all hidden frames."""
+        for frame in list(self.idle):
+            self.forget(frame)
+            frame.Destroy()
+
+    def on_close(self, event):
+        """Release the frame instead of letting it be destroyed.
+
+        If the close cannot be vetoed, the frame is forgotten instead. If no
+        other top level windows are shown, the frame is forgotten, and all
+        hidden frames are destroyed, so the application can exit."""
+        frame = event.GetEventObject()
+        last = not self.others_shown(frame)
+        if event.CanVeto() and not last:
+            event.Veto()
+            self.release(frame)
+        else:
+            self.forget(frame)
+            if last:
+                self.clear()
+            event.Skip()
+
+    def on_destroy(self, event):
+        """Forget frames which are destroyed without being closed first."""
+        window = event.GetEventObject()
+        if window in self.keys:
+            self.forget(window)
+        event.Skip()
+
+    def others_shown(self, frame):
+        """Return True if any top level window other than frame is shown."""
+        return any(
+            window is not frame and window.IsShown()
+            for window in wx.GetTopLevelWindows()
+        )
+
+    def snapshot(self, window):
+        """Return a list of (setter, value) pairs which will restore every
+        control in window to its current value."""
+        res = []
+        for child in window.GetChildren():
+            for cls, getter, setter in self.resetters:
+                if isinstance(child, cls):
+                    if isinstance(getter, str):
+                        value = getattr(child, getter)()
+                    else:
+                        value = getter(child)
+                    if isinstance(setter, str):
+                        setter = getattr(child, setter)
+                    else:
+                        setter = partial(setter, child)
+                    res.append((setter, value))
+                    break
+            else:
+                res.extend(self.snapshot(child))
+        return res
@@ -0,0 +1,169 @@
+"""Provides the RepeatTemplate class, used by the repeat tag."""
+
+from collections.abc import Mapping
+from string import Template
+from xml.etree.ElementTree import Element
+
+
+class Placeholders(dict):
+    """A dictionary which leaves unknown placeholders alone."""
+
+    def __missing__(self, key):
+        return '$' + key
+
+
+def escape(text):
+    """Escape braces so text can be used in a format string."""
+    return text.replace('{', '{{').replace('}', '}}')
+
+
+def compile_text(text, reserved=frozenset()):
+    """If text contains placeholders, return a format string which can be
+    used with str.format_map. Otherwise return None.
+
+    Converting the $name syntax used by string.Template means items can be
+    substituted without going through a regular expression for every item.
+
+    Placeholders named in reserved are left as they are, to be filled in by a
+    nested repeat tag. If reserved is not empty, $$ is left alone too, so the
+    nested tag sees the same text as it would have on its own."""
+    if text is None or '$' not in text:
+        return None
+    parts = []
+    position = 0
+    for match in Template.pattern.finditer(text):
+        parts.append(escape(text[position:match.start()]))
+        position = match.end()
+        name = match.group('named') or match.group('braced')
+        if name is None:
+            if match.group('escaped') is not None and reserved:
+                parts.append('$$')
+            else:
+                # Either $$ or a lone $.
+                parts.append('$')
+        elif name in reserved:
+            parts.append(escape(match.group()))
+        else:
+            parts.append('{%s}' % name)
+    parts.append(escape(text[position:]))
+    return ''.join(parts)
+
+
+class StampedElement(Element):
+    """An element created by a Stamp.
+
+    If none of the attributes of the stamp (except name) contain placeholders,
+    then converted is a dictionary shared between every element created by
+    that stamp, allowing attributes to be converted once for all items.
+    Otherwise it is None."""
+
+    __slots__ = ('converted',)
+
+
+class Stamp:
+    """A compiled node which can be stamped out once per item.
+
+    Attributes without placeholders are stored in static, and are copied
+    as-is. Everything else is stored as a format string, and substituted for
+    each item.
+
+    reserved is a set of placeholder names which belong to a nested repeat
+    tag, and should be left for that tag to fill in. The children of a
+    nested repeat tag reserve its as name and $index."""
+
+    __slots__ = (
+        'tag', 'static', 'dynamic', 'converted', 'text', 'tail', 'children'
+    )
+
+    def __init__(self, node, reserved=frozenset()):
+        self.tag = node.tag
+        self.static = {}
+        dynamic = []
+        for name, value in node.attrib.items():
+            if name == 'name' and '$' not in value:
+                # Give each item a unique name. The index is added directly,
+                # since $index may be reserved.
+                fmt = escape(value) + '_{index}'
+            else:
+                fmt = compile_text(value, reserved)
+            if fmt is None:
+                self.static[name] = value
+            else:
+                dynamic.append((name, fmt))
+        self.dynamic = tuple(dynamic)
+        if all(name == 'name' for name, fmt in dynamic):
+            self.converted = {}
+        else:
+            self.converted = None
+        self.text = (node.text, compile_text(node.text, reserved))
+        self.tail = (node.tail, compile_text(node.tail, reserved))
+        if node.tag == 'repeat':
+            reserved = reserved | {node.attrib.get('as', 'item'), 'index'}
+        self.children = tuple(Stamp(child, reserved) for child in node)
+
+    def stamp(self, mapping):
+        """Return a new node, using mapping to fill in any placeholders.
+
+        mapping should be a Placeholders instance."""
+        if self.dynamic:
+            attrib = self.static.copy()
+            for name, fmt in self.dynamic:
+                attrib[name] = fmt.format_map(mapping)
+            node = StampedElement(self.tag, attrib)
+        else:
+            node = StampedElement(self.tag, self.static)
+        node.converted = self.converted
+        text, fmt = self.text
+        if fmt is None:
+            node.text = text
+        else:
+            node.text = fmt.format_map(mapping)
+        tail, fmt = self.tail
+        if fmt is None:
+            node.tail = tail
+        else:
+            node.tail = fmt.format_map(mapping)
+        for child in self.children:
+            node.append(child.stamp(mapping))
+        return node
+
+
+class RepeatTemplate:
+    """The compiled children of a repeat tag.
+
+    name is the placeholder each item is available as. If an item is a
+    mapping, its keys are available as placeholders too. The position of the
+    item is available as $index.
+
+    Any name attributes which contain no placeholders have _$index appended,
+    so that every control gets a unique name.
+
+    Repeat tags may be nested. The as name and $index of a nested tag are
+    left for it to fill in, so they refer to its own items, while any other
+    placeholders are filled in by the outer tag. Names without placeholders
+    get both indices, so <text name="value"> becomes value_0_1 for the
+    second inner item of the first outer item."""
+
+    __slots__ = ('name', 'stamps')
+
+    def __init__(self, node, name='item'):
+        self.name = name
+        self.stamps = tuple(Stamp(child) for child in node)
+
+    def get_mapping(self, index, item):
+        """Return the mapping used to fill in the placeholders for item."""
+        if isinstance(item, Mapping):
+            mapping = Placeholders(item)
+        else:
+            mapping = Placeholders()
+        mapping[self.name] = str(item)
+        mapping['index'] = str(index)
+        return mapping
+
+    def expand(self, items):
+        """Yield a new node for every child of the template, for every item in
+        items."""
+        for index, item in enumerate(items):
+            mapping = self.get_mapping(index, item)
+            for stamp in self.stamps:
+                yield stamp.stamp(mapping)
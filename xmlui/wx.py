@@ -1,40 +1,158 @@
 """Provides the WXXMLParser class."""
 
+from functools import partial
+from time import monotonic
+from weakref import WeakKeyDictionary
 import wx
 from wx.lib.agw.floatspin import FloatSpin
 from wx.lib.intctrl import IntCtrl
-from .base import XMLParser
-
-
-class DuplicateSizerError(Exception):
-    """There is already a main sizer."""
-
-
-class InvalidTagError(Exception):
-    """Invalid tag found."""
-
-
-class NoValueError(Exception):
-    """No value was provided where one should be."""
-
-
-class NoParent:
-    """Used to specify a default panel should not be created."""
-
-    def __str__(self):
-        return 'No Parent'
-
-    def __repr__(self):
-        return str(self)
+from .base import XMLParser, NoParent, no_parent  # noqa: F401
+from .controls import ControlsXMLParser, get_schemas
+from .exc import (  # noqa: F401
+    DuplicateSizerError, InvalidTagError, NoValueError
+)
+from .items import CompactStrings
+from .layout import flatten_rows
+
+
+class VirtualListBox(wx.ListCtrl):
+    """A list box which draws its items on demand from a CompactStrings
+    instance, so it can hold very large numbers of items.
+
+    Typing jumps to the first item (in alphabetical order) which starts with
+    the letters typed so far. The letters are forgotten after
+    typeahead_timeout seconds without a key press.
+
+    The methods of wx.ListBox which deal with the selection and strings are
+    provided, so the two can be used interchangeably."""
+
+    # Styles which are needed for this control to work.
+    required_style = (
+        wx.LC_REPORT | wx.LC_VIRTUAL | wx.LC_NO_HEADER | wx.LC_SINGLE_SEL
+    )
+
+    typeahead_timeout = 1.0
+
+    def __init__(self, parent, choices=(), style=0):
+        super().__init__(parent, style=style | self.required_style)
+        self.AppendColumn('')
+        self.typeahead = ''
+        self.last_key = 0.0
+        self.Bind(wx.EVT_SIZE, self.on_size)
+        self.Bind(wx.EVT_CHAR, self.on_char)
+        self.set_items(choices)
+
+    def SetWindowStyleFlag(self, style):
+        """Make sure the required styles are never removed."""
+        super().SetWindowStyleFlag(style | self.required_style)
+
+    SetWindowStyle = SetWindowStyleFlag
+
+    def OnGetItemText(self, item, column):
+        """Get the text for the given item from self.items."""
+        return self.items[item]
+
+    def set_items(self, items):
+        """Replace all the items."""
+        self.items = CompactStrings(items)
+        self.SetItemCount(len(self.items))
+        self.Refresh()
+
+    def append_items(self, items):
+        """Add items to the end."""
+        self.items.extend(items)
+        self.SetItemCount(len(self.items))
+        self.Refresh()
+
+    def GetCount(self):
+        return len(self.items)
+
+    def GetString(self, n):
+        return self.items[n]
+
+    def GetStrings(self):
+        return list(self.items)
+
+    def FindString(self, string, caseSensitive=False):
+        """Return the index of the first item which is equal to string, or
+        wx.NOT_FOUND, like wx.ListBox.FindString."""
+        if caseSensitive:
+            for n, item in enumerate(self.items):
+                if item == string:
+                    return n
+        else:
+            string = string.lower()
+            for n, item in enumerate(self.items):
+                if item.lower() == string:
+                    return n
+        return wx.NOT_FOUND
+
+    def find_prefix(self, prefix):
+        """Return the index of the first item (in alphabetical order) which
+        starts with prefix, ignoring case, or wx.NOT_FOUND. This is the search
+        used when typing."""
+        return self.items.find(prefix)
+
+    def GetSelection(self):
+        return self.GetFirstSelected()
+
+    def SetSelection(self, n):
+        """Select, focus and show item n. If n is wx.NOT_FOUND, clear the
+        selection instead."""
+        if n == wx.NOT_FOUND:
+            selected = self.GetFirstSelected()
+            if selected != wx.NOT_FOUND:
+                self.Select(selected, on=0)
+        else:
+            self.Select(n)
+            self.Focus(n)
+            self.EnsureVisible(n)
+
+    def GetStringSelection(self):
+        n = self.GetSelection()
+        if n == wx.NOT_FOUND:
+            return ''
+        return self.items[n]
+
+    def on_size(self, event):
+        """Make the only column fill the control."""
+        self.SetColumnWidth(0, self.GetClientSize()[0])
+        event.Skip()
+
+    def on_char(self, event):
+        """Jump to the first matching item."""
+        key = event.GetUnicodeKey()
+        if key == wx.WXK_NONE or key < 32:
+            event.Skip()
+            return
+        now = monotonic()
+        if now - self.last_key > self.typeahead_timeout:
+            self.typeahead = ''
+        self.last_key = now
+        self.typeahead += chr(key)
+        n = self.find_prefix(self.typeahead)
+        if n != wx.NOT_FOUND:
+            self.SetSelection(n)
+
+
+class WXXMLParser(ControlsXMLParser):
+    """Populate wx.Frame instances from XML."""
 
+    # The attributes which are handled by parse_node are stored under '*'.
+    schemas = {
+        **ControlsXMLParser.schemas, **get_schemas(partial(getattr, wx))
+    }
 
-no_parent = NoParent()
+    # If True, stacks of label/control rows are replaced by flexgrid tags
+    # before parsing. See xmlui.layout.flatten_rows.
+    optimize_layout = False
 
+    # A WeakKeyDictionary of root: optimized root pairs, created the first
+    # time a layout is optimized. The value is None if root did not need
+    # optimizing.
+    layouts = None
 
-class WXXMLParser(XMLParser):
-    """Populate wx.Frame instances from XML."""
-
-    def populate_from_root(self, root, frame, parent=no_parent):
+    def populate_from_root(self, root, frame, parent=no_parent, data=None):
         """
         Overrides the default populate_from_root to add wx-specific code. In
         particular the parent argument.
@@ -54,23 +172,44 @@ class WXXMLParser(XMLParser):
         parent: The parent to use for control creation.
         sizer: The sizer the created control should be added to.
 
+        If self.optimize_layout is True, root is passed through
+        xmlui.layout.flatten_rows first. The result is cached for as long as
+        root exists.
+
         Everything else is the same.
         """
+        root = self.expand_includes(root)
+        if self.optimize_layout:
+            layouts = self.layouts
+            if layouts is None:
+                layouts = self.layouts = WeakKeyDictionary()
+            try:
+                optimized = layouts[root]
+            except KeyError:
+                optimized = flatten_rows(root)
+                if optimized is root:
+                    # Storing root as its own value would stop it from ever
+                    # being freed.
+                    optimized = None
+                layouts[root] = optimized
+            if optimized is not None:
+                root = optimized
         sizer = None
         if parent is no_parent:
             parent = frame
         elif parent is None:
             parent = wx.Panel(frame)
-        for node in root:
-            res = self.parse_node(node, frame, parent, sizer)
-            if isinstance(res, wx.Sizer):
-                if sizer is not None:
-                    raise DuplicateSizerError(
-                        'Sizer %r is the second sizer (first was %r).' % (
-                            res, sizer
+        with self.populating(root, data):
+            for node in root:
+                res = self.parse_node(node, frame, parent, sizer)
+                if isinstance(res, wx.Sizer):
+                    if sizer is not None:
+                        raise DuplicateSizerError(
+                            'Sizer %r is the second sizer (first was %r).' % (
+                                res, sizer
+                            )
                         )
-                    )
-                sizer = res
+                    sizer = res
         if sizer is not None:
             parent.SetSizerAndFit(res)
 
@@ -82,26 +221,49 @@ class WXXMLParser(XMLParser):
             default |= getattr(wx, entry)
         return default
 
+    def set_items(self, control, items):
+        """Replace all the items in control, which can be a wx.Choice,
+        wx.ListBox, or VirtualListBox instance.
+
+        The control is frozen, and the items are set with one call, so it is
+        only redrawn once."""
+        if isinstance(control, VirtualListBox):
+            return control.set_items(items)
+        control.Freeze()
+        try:
+            control.Set(list(items))
+        finally:
+            control.Thaw()
+
+    def append_items(self, control, items):
+        """Add items to the end of control in one call. Works in the same way
+        as set_items."""
+        if isinstance(control, VirtualListBox):
+            return control.append_items(items)
+        control.Freeze()
+        try:
+            control.Append(list(items))
+        finally:
+            control.Thaw()
+
     def parse_node(self, node, frame, parent, sizer):
         """Parse a single node."""
         res = super().parse_node(node, frame, parent, sizer)
-        a = node.attrib
-        label = a.get('label', None)
+        if node.tag in self.transparent_tags:
+            return res
+        a = self.get_converter('*')(node)
+        label = a['label']
         if label is not None:
             res.SetLabel(label)
-        style = a.get('style', None)
-        if style is not None:
-            res.SetWindowStyle(self.get_flags(style))
-        size = a.get('size', None)
+        style = a['style']
+        if style is not None and node.tag not in self.styled_tags:
+            res.SetWindowStyle(style)
+        size = a['size']
         if size is not None:
-            size = self.get_list(size)
             res.SetSize(size)
         if sizer is not None:
-            proportion = int(a.get('sizer_proportion', '0'))
-            flags = a.get('sizer_flag', 'grow')
-            flags = self.get_flags(flags)
-            sizer.Add(res, proportion, flags)
-        binders = a.get('bind', None)
+            sizer.Add(res, a['sizer_proportion'], a['sizer_flag'])
+        binders = a['bind']
         if binders is not None:
             for binder in binders.split(','):
                 event_name, func_name = binder.split(':')
@@ -116,8 +278,27 @@ class WXXMLParser(XMLParser):
 
     def parse_sizer(self, node, frame, parent, sizer):
         """Parse a sizer and all contained nodes."""
-        flags = self.get_flags(node.attrib.get('orient', 'horizontal'))
-        s = wx.BoxSizer(flags)
+        s = wx.BoxSizer(self.get_attributes(node)['orient'])
+        for child in node:
+            self.parse_node(child, frame, parent, s)
+        return s
+
+    def parse_grid(self, node, frame, parent, sizer):
+        """Parse a grid sizer and all contained nodes."""
+        a = self.get_attributes(node)
+        s = wx.GridSizer(a['rows'], a['cols'], a['vgap'], a['hgap'])
+        for child in node:
+            self.parse_node(child, frame, parent, s)
+        return s
+
+    def parse_flexgrid(self, node, frame, parent, sizer):
+        """Parse a flex grid sizer and all contained nodes."""
+        a = self.get_attributes(node)
+        s = wx.FlexGridSizer(a['rows'], a['cols'], a['vgap'], a['hgap'])
+        for index in a['growable_rows']:
+            s.AddGrowableRow(index)
+        for index in a['growable_cols']:
+            s.AddGrowableCol(index)
         for child in node:
             self.parse_node(child, frame, parent, s)
         return s
@@ -132,24 +313,16 @@ class WXXMLParser(XMLParser):
 
     def parse_integer(self, node, frame, parent, sizer):
         """Create a control that accepts integers."""
-        a = node.attrib
-        min_value = a.get('min', None)
-        if min_value is not None:
-            min_value = int(min_value)
-        max_value = a.get('max', None)
-        if max_value is not None:
-            max_value = int(max_value)
-        limited = int(a.get('limited', 0))
-        allow_none = int(a.get('allow_none', 0))
-        allow_long = int(a.get('allow_long', 0))
+        a = self.get_attributes(node)
         value = node.text
         if value is None:
             value = 0
         else:
             value = int(value)
         return IntCtrl(
-            parent, min=min_value, max=max_value, limited=limited,
-            allow_none=allow_none, allow_long=allow_long, value=value
+            parent, min=a['min'], max=a['max'], limited=a['limited'],
+            allow_none=a['allow_none'], allow_long=a['allow_long'],
+            value=value
         )
 
     def parse_float(self, node, frame, parent, sizer):
@@ -158,18 +331,10 @@ class WXXMLParser(XMLParser):
             value = 0.0
         else:
             value = float(node.text)
-        a = node.attrib
-        min_value = a.get('min', None)
-        if min_value is not None:
-            min_value = float(min_value)
-        max_value = a.get('max', None)
-        if max_value is not None:
-            max_value = float(max_value)
-        increment = float(a.get('increment', 1.0))
-        digits = int(a.get('digits', -1))
+        a = self.get_attributes(node)
         return FloatSpin(
-            parent, value=value, min_val=min_value, max_val=max_value,
-            increment=increment, digits=digits
+            parent, value=value, min_val=a['min'], max_val=a['max'],
+            increment=a['increment'], digits=a['digits']
         )
 
     def parse_slider(self, node, frame, parent, sizer):
@@ -178,11 +343,9 @@ class WXXMLParser(XMLParser):
             value = 0
         else:
             value = int(node.text)
-        a = node.attrib
-        min_value = int(a.get('min', 0))
-        max_value = int(a.get('max', 100))
+        a = self.get_attributes(node)
         return wx.Slider(
-            parent, value=value, minValue=min_value, maxValue=max_value
+            parent, value=value, minValue=a['min'], maxValue=a['max']
         )
 
     def parse_checkbox(self, node, frame, parent, sizer):
@@ -194,34 +357,28 @@ class WXXMLParser(XMLParser):
 
     def parse_button(self, node, frame, parent, sizer):
         """Returns a button."""
-        a = node.attrib
         b = wx.Button(parent)
-        default = int(a.get('default', 0))
-        if default:
+        if self.get_attributes(node)['default']:
             b.SetDefault()
         return b
 
     def parse_choice(self, node, frame, parent, sizer):
         """Get a popup button."""
-        choices = node.attrib.get('choices', None)
-        if choices is None:
-            choices = []
-        else:
-            choices = self.get_list(choices, function=str)
+        choices = self.get_attributes(node)['choices'] or []
         choice = wx.Choice(parent, choices=choices)
         if node.text is not None:
             choice.SetSelection(int(node.text))
         return choice
 
     def parse_list(self, node, frame, parent, sizer):
-        """Return a simple list box."""
-        a = node.attrib
-        choices = a.get('choices', None)
-        if choices is None:
-            choices = []
+        """Return a simple list box, or a VirtualListBox if the virtual
+        attribute is non-0."""
+        a = self.get_attributes(node)
+        choices = a['choices'] or []
+        if a['virtual']:
+            b = VirtualListBox(parent, choices=choices)
         else:
-            choices = self.get_list(choices, function=str)
-        b = wx.ListBox(parent, choices=choices)
+            b = wx.ListBox(parent, choices=choices)
         if node.text is not None:
             b.SetSelection(int(node.text))
         return b
@@ -231,8 +388,7 @@ class WXXMLParser(XMLParser):
         # We have to include the style with this control, otherwise adding
         # items with Append will fail when there are multiple columns, and the
         # default style is specified.
-        style = self.get_flags(node.attrib.pop('style', 'lc_icon'))
-        c = wx.ListCtrl(parent, style=style)
+        c = wx.ListCtrl(parent, style=self.get_attributes(node)['style'])
         value = None
         items = []
         for tag in node:
@@ -252,22 +408,3 @@ class WXXMLParser(XMLParser):
             c.Focus(value)
             c.Select(value)
         return c
-
-    def parse_value(self, node, frame, parent, sizer):
-        """Get a value as an integer."""
-        return int(node.text)
-
-    def parse_column(self, node, frame, parent, sizer):
-        """Return args that can be sent to wx.ListCtrl.AppendColumn."""
-        heading = node.text
-        if heading is None:
-            raise NoValueError(node)
-        a = node.attrib
-        format = a.get('format', 'list_format_left')
-        format = self.get_flags(format)
-        width = int(a.get('width', -1))
-        return (heading, format, width)
-
-    def parse_item(self, node, frame, parent, sizer):
-        """Parse a list item."""
-        return self.get_list(node.text, function=str)